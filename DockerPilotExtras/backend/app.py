@@ -35,6 +35,7 @@ from utils.pipeline_generator import (
     generate_deployment_config_for_environment
 )
 from backend.api import register_api_routes
+from backend.config import Config
 from backend.preflight import run_preflight_checks
 from backend.resources.auth import create_auth_resources
 from backend.resources.commands import create_command_resources
@@ -619,14 +620,11 @@ def require_auth_for_api():
     return None
 
 # Configuration
-app.config['CONFIG_DIR'] = Path.home() / ".dockerpilot_extras"
-app.config['CONFIG_DIR'].mkdir(exist_ok=True)
-app.config['PIPELINES_DIR'] = app.config['CONFIG_DIR'] / "pipelines"
-app.config['PIPELINES_DIR'].mkdir(exist_ok=True)
-app.config['DEPLOYMENTS_DIR'] = app.config['CONFIG_DIR'] / "deployments"
-app.config['DEPLOYMENTS_DIR'].mkdir(exist_ok=True)
-app.config['SERVERS_DIR'] = app.config['CONFIG_DIR'] / "servers"
-app.config['SERVERS_DIR'].mkdir(exist_ok=True)
+Config.ensure_dirs()
+app.config['CONFIG_DIR'] = Config.CONFIG_DIR
+app.config['PIPELINES_DIR'] = Config.PIPELINES_DIR
+app.config['DEPLOYMENTS_DIR'] = Config.DEPLOYMENTS_DIR
+app.config['SERVERS_DIR'] = Config.SERVERS_DIR
 
 _storage_runtime_config = {}
 _state_store = None
@@ -3,20 +3,26 @@ Configuration settings for Flask backend
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
+def get_config_dir():
+    """Return the per-user DockerPilot Extras directory (resolved once per process)"""
+    return Path.home() / ".dockerpilot_extras"
+
+
 class Config:
     """Base configuration"""
     # SECRET_KEY should be set via environment variable in production
     # For development, a random key is generated in app.py if not set
     SECRET_KEY = os.environ.get('SECRET_KEY', None)
-    CONFIG_DIR = Path.home() / ".dockerpilot_extras"
-    CONFIG_DIR.mkdir(exist_ok=True)
+    # Directories are created by ensure_dirs() during app setup, not on import
+    CONFIG_DIR = get_config_dir()
     PIPELINES_DIR = CONFIG_DIR / "pipelines"
-    PIPELINES_DIR.mkdir(exist_ok=True)
     DEPLOYMENTS_DIR = CONFIG_DIR / "deployments"
-    DEPLOYMENTS_DIR.mkdir(exist_ok=True)
+    SERVERS_DIR = CONFIG_DIR / "servers"
     
     # CORS settings
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
@@ -26,16 +32,26 @@ class Config:
     DEBUG = os.environ.get('FLASK_ENV') == 'development'
     HOST = os.environ.get('HOST', '0.0.0.0')
 
+    @classmethod
+    def ensure_dirs(cls):
+        """Create the configuration directories (idempotent)"""
+        for path in (cls.CONFIG_DIR, cls.PIPELINES_DIR, cls.DEPLOYMENTS_DIR, cls.SERVERS_DIR):
+            path.mkdir(parents=True, exist_ok=True)
+
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SECRET_KEY = os.environ.get('SECRET_KEY')
-    if not SECRET_KEY:
-        raise ValueError("SECRET_KEY must be set in production")
+
+    @classmethod
+    def ensure_dirs(cls):
+        # Checked at app setup rather than import so backend.config stays importable
+        if not cls.SECRET_KEY:
+            raise ValueError("SECRET_KEY must be set in production")
+        super().ensure_dirs()
 
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
-
@@ -6,9 +6,44 @@ Checks if all requirements are met before running the web application
 
 import sys
 import os
+import importlib.util
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# External tools whose `--version` output the checks rely on
+VERSION_PROBES = {
+    "node": ["node", "--version"],
+    "npm": ["npm", "--version"],
+    "docker": ["docker", "--version"],
+    "dockerpilot": ["dockerpilot", "--version"],
+}
+
+
+@lru_cache(maxsize=None)
+def probe_version(name):
+    """Run a version probe once and return its output, or None if unavailable"""
+    try:
+        # Only stdout is needed; no stderr pipe and no text-mode decoding
+        result = subprocess.run(
+            VERSION_PROBES[name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=5
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('ascii', 'replace').strip()
+
+
+def probe_versions(names=tuple(VERSION_PROBES)):
+    """Run version probes concurrently, so the total wait is the slowest probe"""
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        return dict(zip(names, executor.map(probe_version, names)))
+
 
 def check_python_version():
     """Check Python version"""
@@ -28,11 +63,11 @@ def check_python_dependencies():
     missing = []
     
     for package in required:
-        try:
-            package_import = package.replace('-', '_')
-            __import__(package_import)
+        # find_spec only consults the import finders; the package is not executed
+        package_import = package.replace('-', '_')
+        if importlib.util.find_spec(package_import) is not None:
             print(f"✓ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package} - missing")
             missing.append(package)
     
@@ -45,28 +80,15 @@ def check_python_dependencies():
 
 def check_node():
     """Check Node.js availability"""
-    try:
-        result = subprocess.run(
-            ["node", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            print(f"✓ Node.js: {result.stdout.strip()}")
-            
-            # Check npm
-            result_npm = subprocess.run(
-                ["npm", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result_npm.returncode == 0:
-                print(f"✓ npm: {result_npm.stdout.strip()}")
-                return True
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+    node_version = probe_version("node")
+    if node_version:
+        print(f"✓ Node.js: {node_version}")
+        
+        # Check npm
+        npm_version = probe_version("npm")
+        if npm_version:
+            print(f"✓ npm: {npm_version}")
+            return True
     
     print("❌ Node.js/npm - not found")
     print("   Install Node.js: https://nodejs.org/")
@@ -89,18 +111,10 @@ def check_frontend_dependencies():
 
 def check_docker():
     """Check Docker availability"""
-    try:
-        result = subprocess.run(
-            ["docker", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            print(f"✓ Docker: {result.stdout.strip()}")
-            return True
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+    docker_version = probe_version("docker")
+    if docker_version:
+        print(f"✓ Docker: {docker_version}")
+        return True
     
     print("❌ Docker - not found")
     print("   Install Docker: https://docs.docker.com/get-docker/")
@@ -109,19 +123,10 @@ def check_docker():
 
 def check_dockerpilot():
     """Check DockerPilot availability"""
-    try:
-        result = subprocess.run(
-            ["dockerpilot", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print(f"✓ DockerPilot: {version}")
-            return True
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+    version = probe_version("dockerpilot")
+    if version:
+        print(f"✓ DockerPilot: {version}")
+        return True
     
     print("❌ DockerPilot - not found")
     print("   Install DockerPilot: https://github.com/DozeyUDK/DockerPilot")
@@ -133,6 +138,9 @@ def main():
     print("DockerPilot Extras (Web) - Configuration Verification\n")
     print("=" * 60)
     
+    # Run all external tool probes up front; the checks below reuse the results
+    probe_versions()
+    
     checks = [
         ("Python", check_python_version, True),
         ("Python Dependencies", check_python_dependencies, True),
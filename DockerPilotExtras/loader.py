@@ -5,110 +5,368 @@ Starts backend (Flask) and frontend (npm) simultaneously.
 Interrupting the script (Ctrl+C) stops both servers.
 """
 
+import argparse
+import hashlib
+import json
 import os
+import re
+import shutil
 import sys
+import importlib.util
 import subprocess
 import signal
 import time
 import socket
-import shutil
+import select
+import selectors
+import threading
 from pathlib import Path
 
-# Processes to manage
-backend_process = None
+from backend.config import get_config_dir
+from check_web_setup import probe_versions
+
+_HERE = Path(__file__).resolve().parent
+_FRONTEND_DIR = _HERE / 'frontend'
+_IS_WIN = sys.platform == 'win32'
+# Hash of the package-lock.json that node_modules was installed from
+_LOCK_HASH_STAMP = '.dockerpilot-lock-hash'
+# Fingerprint of the node/npm/python binaries that last passed check_dependencies()
+_DEPS_CACHE_FILE = get_config_dir() / '.deps_ok.json'
+
+# Vite start-up banner, e.g. "➜  Local:   http://localhost:3001/"
+_LOCAL_RE = re.compile(r'Local:\s+http://localhost:(\d+)')
+# e.g. "➜  Network: http://192.168.0.58:3001/"
+_NETWORK_RE = re.compile(r'Network:\s+http://([\d.]+):(\d+)')
+# Messages npm/Vite print when the optional rollup native package is missing
+_ROLLUP_ERROR_MARKERS = (
+    'npm has a bug related to optional dependencies',
+    '@rollup/rollup-linux-x64-gnu',
+)
+
+
+def _is_rollup_error(text_lower):
+    """Checks lowercased output for the rollup optional-dependency failure"""
+    if 'cannot find module' in text_lower and (
+            '@rollup/rollup' in text_lower or 'rollup-linux' in text_lower):
+        return True
+    return any(marker in text_lower for marker in _ROLLUP_ERROR_MARKERS)
+
+class _Stream:
+    """Output state of one monitored process"""
+
+    def __init__(self, process, label, on_line):
+        self.process = process
+        self.label = label
+        self.on_line = on_line
+        self.buffer = b''
+        self.exit_fd = None
+
+    def emit(self, raw_line):
+        line = raw_line.decode('utf-8', 'replace').rstrip()
+        if line:
+            print(f"[{self.label}] {line}")
+            if self.on_line:
+                self.on_line(line)
+
+
+def _open_exit_fd(pid):
+    """Returns a selectable object that becomes readable when the process exits.
+
+    That is a pidfd on Linux and a kqueue holding an EVFILT_PROC/NOTE_EXIT
+    filter on macOS/BSD; None where neither is available.
+    """
+    if hasattr(os, 'pidfd_open'):
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            return None
+    if hasattr(select, 'kqueue'):
+        kq = select.kqueue()
+        try:
+            kq.control([select.kevent(pid, filter=select.KQ_FILTER_PROC,
+                                      flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                                      fflags=select.KQ_NOTE_EXIT)], 0)
+        except OSError:
+            kq.close()
+            return None
+        return kq
+    return None
+
+
+def _close_exit_fd(exit_fd):
+    """Closes what _open_exit_fd returned"""
+    if isinstance(exit_fd, int):
+        os.close(exit_fd)
+    else:
+        exit_fd.close()
+
+
+class OutputMonitor:
+    """Multiplexes child process output and exit notifications on one selector.
+
+    Pipes are read non-blocking from the calling thread, so start-up checks
+    can stop waiting as soon as a relevant line arrives. A pidfd (Linux) or
+    kqueue process filter (macOS/BSD) per process wakes the selector when the
+    process exits - pipe EOF alone is not enough, as npm's grandchildren keep
+    the pipe open. Threads report their exit through wake(). Windows cannot
+    select on pipes, so there each pipe gets a reader thread instead.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._streams = {}
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ, None)
+        self._woken = False
+
+    def wake(self):
+        """Interrupts a pending pump(); safe to call from any thread"""
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            pass  # Buffer full - a wakeup is already pending
+
+    def attach(self, process, label, on_line=None):
+        """Starts echoing the process output, passing each line to on_line"""
+        stream = _Stream(process, label, on_line)
+        self._streams[process] = stream
+        if _IS_WIN:
+            threading.Thread(target=self._read_blocking, args=(stream,), daemon=True).start()
+            return
+        os.set_blocking(process.stdout.fileno(), False)
+        self._selector.register(process.stdout, selectors.EVENT_READ, stream)
+        stream.exit_fd = _open_exit_fd(process.pid)
+        if stream.exit_fd is not None:
+            self._selector.register(stream.exit_fd, selectors.EVENT_READ, stream)
+
+    def detach(self, process):
+        """Stops monitoring the process and closes its output pipe"""
+        stream = self._streams.pop(process, None)
+        if stream is None:
+            return
+        if not _IS_WIN:
+            self.flush(process, stream)
+            self._unregister(process.stdout)
+            if stream.exit_fd is not None:
+                self._unregister(stream.exit_fd)
+                _close_exit_fd(stream.exit_fd)
+        try:
+            process.stdout.close()
+        except OSError:
+            pass
+
+    def flush(self, process, stream=None):
+        """Reads whatever output the process has already written"""
+        stream = stream or self._streams.get(process)
+        if stream is not None and not _IS_WIN:
+            while not process.stdout.closed and self._read(stream):
+                pass
+
+    def pump(self, timeout=None):
+        """Handles ready output for up to timeout seconds (None blocks until an event)"""
+        for key, _ in self._selector.select(timeout):
+            stream = key.data
+            if stream is None:
+                # wake(): drain the wakeup bytes so the next pump blocks again
+                self._woken = True
+                try:
+                    while self._wakeup_recv.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            elif key.fileobj is stream.exit_fd:
+                # Process exited; the fd stays readable, so stop watching it
+                self._unregister(stream.exit_fd)
+            else:
+                self._read(stream)
+
+    def wait_for_exit(self, processes, threads=()):
+        """Keeps echoing output until one of the processes or threads ends and returns it"""
+        while True:
+            for process in processes:
+                if process.poll() is not None:
+                    return process
+            for thread in threads:
+                if not thread.is_alive():
+                    return thread
+            # Threads wake the selector when they end (see wake()); without an
+            # exit fd for every process, process exits are re-checked once per second
+            watched = all(
+                process in self._streams and self._streams[process].exit_fd is not None
+                for process in processes
+            )
+            self.pump(None if watched else 1)
+            if self._woken:
+                self._woken = False
+                # wake() is the last call of an ending thread; let it finish
+                for thread in threads:
+                    thread.join(0.1)
+
+    def _read(self, stream):
+        """Reads one chunk; returns False when nothing is left to read right now"""
+        try:
+            chunk = os.read(stream.process.stdout.fileno(), 65536)
+        except BlockingIOError:
+            return False
+        if not chunk:
+            # EOF - emit the trailing partial line and stop watching the pipe
+            self._unregister(stream.process.stdout)
+            if stream.buffer:
+                stream.emit(stream.buffer)
+                stream.buffer = b''
+            return False
+        *lines, stream.buffer = (stream.buffer + chunk).split(b'\n')
+        for line in lines:
+            stream.emit(line)
+        return True
+
+    def _read_blocking(self, stream):
+        for raw_line in iter(stream.process.stdout.readline, b''):
+            stream.emit(raw_line)
+
+    def _unregister(self, fileobj):
+        try:
+            self._selector.unregister(fileobj)
+        except (KeyError, ValueError):
+            pass
+
+
+# Servers to manage: the backend runs in-process, the frontend is a child process
+backend_server = None
+backend_thread = None
 frontend_process = None
+install_process = None  # npm install/ci while it runs
 backend_port = 5000  # Default port
+output_monitor = OutputMonitor()
+
+# Frontend start attempts (each retry follows a rollup dependency fix)
+MAX_START_ATTEMPTS = 3
+
+
+def _signal_process_group(process, sig):
+    """Sends a signal to the process and its children (whole group on Unix)"""
+    try:
+        if _IS_WIN:
+            # No process groups; terminate() ends the process outright
+            process.terminate()
+        else:
+            try:
+                os.killpg(os.getpgid(process.pid), sig)
+            except (OSError, ProcessLookupError):
+                # Process no longer exists or has no group
+                os.kill(process.pid, sig)
+    except (OSError, ProcessLookupError):
+        # Process no longer exists
+        pass
+
+
+def wait_for_processes(processes, timeout):
+    """Waits for all processes with one shared deadline; returns those still running"""
+    deadline = time.monotonic() + timeout
+    pending = [p for p in processes if p.poll() is None]
+    pidfds = []
+    try:
+        with selectors.DefaultSelector() as sel:
+            for process in pending:
+                try:
+                    pidfd = os.pidfd_open(process.pid)
+                except (AttributeError, OSError):
+                    continue
+                pidfds.append(pidfd)
+                sel.register(pidfd, selectors.EVENT_READ, process)
+            
+            if len(pidfds) == len(pending):
+                # Kernel tells us when each process exits
+                while pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    for key, _ in sel.select(remaining):
+                        sel.unregister(key.fileobj)
+                    pending = [p for p in pending if p.poll() is None]
+                return pending
+    finally:
+        for pidfd in pidfds:
+            os.close(pidfd)
+    
+    # No pidfd support - wait on each process in turn within the same deadline
+    for process in pending:
+        try:
+            process.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            pass
+    return [p for p in pending if p.poll() is None]
 
 
 def signal_handler(sig, frame):
     """Handle interruption (Ctrl+C)"""
     print("\n\n🛑 Stopping servers...")
     
+    children = {}
     if frontend_process and frontend_process.poll() is None:
         print("Stopping frontend (npm)...")
-        try:
-            # Send SIGTERM to process and all its children
-            if sys.platform == 'win32':
-                frontend_process.terminate()
-            else:
-                try:
-                    os.killpg(os.getpgid(frontend_process.pid), signal.SIGTERM)
-                except (OSError, ProcessLookupError):
-                    # Process no longer exists or has no group
-                    frontend_process.terminate()
-        except (OSError, ProcessLookupError) as e:
-            # Process no longer exists
-            pass
-        except Exception as e:
-            print(f"Error stopping frontend: {e}")
+        children[frontend_process] = 'frontend'
+    if install_process and install_process.poll() is None:
+        print("Stopping npm install...")
+        children[install_process] = 'npm install'
+    for process in children:
+        _signal_process_group(process, signal.SIGTERM)
     
-    if backend_process and backend_process.poll() is None:
+    if backend_server:
         print("Stopping backend (Flask)...")
         try:
-            backend_process.terminate()
-        except (OSError, ProcessLookupError):
-            # Process no longer exists
-            pass
+            backend_server.shutdown()
+            backend_server.server_close()
         except Exception as e:
             print(f"Error stopping backend: {e}")
     
-    # Wait for processes to finish
-    if frontend_process and frontend_process.poll() is None:
-        try:
-            frontend_process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            print("Forcing frontend termination...")
-            try:
-                if sys.platform != 'win32':
-                    try:
-                        os.killpg(os.getpgid(frontend_process.pid), signal.SIGKILL)
-                    except (OSError, ProcessLookupError):
-                        frontend_process.kill()
-                else:
-                    frontend_process.kill()
-            except (OSError, ProcessLookupError):
-                pass
-        except (OSError, ProcessLookupError):
-            pass
-    
-    if backend_process and backend_process.poll() is None:
-        try:
-            backend_process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            print("Forcing backend termination...")
-            try:
-                backend_process.kill()
-            except (OSError, ProcessLookupError):
-                pass
-        except (OSError, ProcessLookupError):
-            pass
+    # Wait for processes to finish - at most 5 seconds in total
+    for process in wait_for_processes(list(children), 5):
+        print(f"Forcing {children[process]} termination...")
+        _signal_process_group(process, getattr(signal, 'SIGKILL', signal.SIGTERM))
     
     print("✅ All servers stopped.")
     sys.exit(0)
 
 
-def check_dependencies():
-    """Checks if required tools are available"""
-    errors = []
-    node_version = None
-    
-    # Check Node.js/npm
+def _tools_fingerprint():
+    """Identifies the installed node, npm and Python binaries; None if a tool is missing"""
+    fingerprint = [sys.version, os.stat(sys.executable).st_mtime_ns]
+    for tool in ('node', 'npm'):
+        path = shutil.which(tool)
+        if path is None:
+            return None
+        fingerprint.append(os.stat(path).st_mtime_ns)
+    return fingerprint
+
+
+def _load_deps_cache():
     try:
-        result = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=5)
-        if result.returncode != 0:
-            errors.append("Node.js is not available")
-        else:
-            node_version = result.stdout.strip()
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        errors.append("Node.js is not installed")
-    
-    # Check npm
+        return json.loads(_DEPS_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _save_deps_cache(fingerprint):
     try:
-        result = subprocess.run(['npm', '--version'], capture_output=True, text=True, timeout=5)
-        if result.returncode != 0:
-            errors.append("npm is not available")
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        errors.append("npm is not installed")
+        _DEPS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _DEPS_CACHE_FILE.write_text(json.dumps(fingerprint), encoding='utf-8')
+    except OSError:
+        pass  # Cache is best-effort
+
+
+def _check_node_tools():
+    """Probes Node.js and npm; returns a list of errors"""
+    errors = []
+    
+    # Check Node.js/npm (probed concurrently, shared with check_web_setup)
+    versions = probe_versions(('node', 'npm'))
+    node_version = versions['node']
+    if node_version is None:
+        errors.append("Node.js is not installed or not available")
+    if versions['npm'] is None:
+        errors.append("npm is not installed or not available")
     
     # Vite 5 requires a modern Node.js (18+). Fail fast with a clear message.
     if node_version:
@@ -122,14 +380,25 @@ def check_dependencies():
             errors.append(f"Unable to parse Node.js version: {node_version}")
         elif major < 18:
             errors.append(f"Node.js {node_version} is too old for the frontend (requires Node.js 18+).")
+    
+    return errors
 
-    # Check Python dependencies
-    try:
-        import flask
-        import flask_cors
-        import flask_restful
-    except ImportError as e:
-        errors.append(f"Missing Python dependency: {e.name}")
+
+def check_dependencies(use_cache=True):
+    """Checks if required tools are available.
+
+    The Node.js/npm probes are skipped while node, npm and the Python
+    interpreter are unchanged since the last successful check.
+    """
+    fingerprint = _tools_fingerprint()
+    tools_verified = (use_cache and fingerprint is not None
+                      and _load_deps_cache() == fingerprint)
+    errors = [] if tools_verified else _check_node_tools()
+
+    # Check Python dependencies (located, not imported)
+    for module_name in ('flask', 'flask_cors', 'flask_restful'):
+        if importlib.util.find_spec(module_name) is None:
+            errors.append(f"Missing Python dependency: {module_name}")
     
     if errors:
         print("❌ Configuration errors:")
@@ -142,21 +411,27 @@ def check_dependencies():
         print("   Node.js (if missing/too old): install Node.js 18+ (recommended: NodeSource or nvm).")
         return False
     
+    if not tools_verified and fingerprint is not None:
+        _save_deps_cache(fingerprint)
     return True
 
 
-def is_port_available(port):
-    """Checks if port is available"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        try:
-            s.bind(('0.0.0.0', port))
-            return True
-        except OSError:
-            return False
+def bind_port(port):
+    """Binds a listening socket for the backend, or returns None if the port is in use"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if not _IS_WIN:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('0.0.0.0', port))
+        sock.listen(128)
+    except OSError:
+        sock.close()
+        return None
+    return sock
 
 
 def ask_for_port():
-    """Asks user for a new port"""
+    """Asks user for a new port and returns its bound listening socket"""
     while True:
         try:
             port_input = input("\n🔧 Port is in use. Enter a new port (or Enter for 5001): ").strip()
@@ -169,11 +444,12 @@ def ask_for_port():
                 print("❌ Port must be in range 1024-65535")
                 continue
             
-            if not is_port_available(port):
+            sock = bind_port(port)
+            if sock is None:
                 print(f"❌ Port {port} is also in use. Try another one.")
                 continue
             
-            return port
+            return sock
         except ValueError:
             print("❌ Invalid port number. Enter a number.")
         except KeyboardInterrupt:
@@ -181,81 +457,150 @@ def ask_for_port():
             sys.exit(0)
 
 
+def _serve_backend():
+    try:
+        backend_server.serve_forever()
+    finally:
+        # Lets output_monitor.wait_for_exit() notice the thread has ended
+        output_monitor.wake()
+
+
+def _launch_backend(listen_socket):
+    """Serves the Flask app from a thread of this process on the listening socket"""
+    global backend_server, backend_thread
+    
+    from run_dev import make_dev_server
+    
+    debug = os.environ.get('FLASK_ENV') == 'development'
+    try:
+        backend_server = make_dev_server(listen_socket, debug)
+    finally:
+        listen_socket.close()  # The server holds its own copy
+    backend_thread = threading.Thread(target=_serve_backend, name='backend', daemon=True)
+    backend_thread.start()
+    
+    # Werkzeug only logs the PIN when it runs its own reloader
+    pin = getattr(backend_server.app, 'pin', None)
+    if debug and pin:
+        print(f"🔑 Debugger PIN: {pin}")
+
+
 def start_backend():
     """Starts Flask backend"""
-    global backend_process, backend_port
+    global backend_port
     
-    backend_dir = Path(__file__).parent
     os.environ.setdefault('FLASK_ENV', 'development')
     
-    # Check if default port is available
-    if not is_port_available(backend_port):
+    # Bind the port up front: once bound, the server cannot fail to start on it
+    listen_socket = bind_port(backend_port)
+    if listen_socket is None:
         print(f"⚠️  Port {backend_port} is in use.")
-        backend_port = ask_for_port()
+        listen_socket = ask_for_port()
     
+    backend_port = listen_socket.getsockname()[1]
     os.environ['PORT'] = str(backend_port)
     
     print(f"🚀 Starting backend (Flask) on port {backend_port}...")
     
     try:
-        backend_process = subprocess.Popen(
-            [sys.executable, str(backend_dir / 'run_dev.py')],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-        
-        # Collect output and detect errors
-        output_lines = []
-        port_error_detected = False
-        
-        def collect_backend_output():
-            nonlocal port_error_detected
-            if backend_process and backend_process.stdout:
-                for line in iter(backend_process.stdout.readline, ''):
-                    if line:
-                        output_lines.append(line.rstrip())
-                        print(f"[BACKEND] {line.rstrip()}")
-                        
-                        # Detect port-related errors
-                        line_lower = line.lower()
-                        if ('address already in use' in line_lower or 
-                            ('port' in line_lower and 'is in use' in line_lower)):
-                            port_error_detected = True
-        
-        import threading
-        backend_thread = threading.Thread(target=collect_backend_output, daemon=True)
-        backend_thread.start()
-        
-        # Wait a moment to check if process started or error occurred
-        time.sleep(3)
-        
-        if port_error_detected or backend_process.poll() is not None:
-            # Stop process if it didn't start
-            if backend_process.poll() is None:
-                backend_process.terminate()
-                backend_process.wait(timeout=2)
-            
-            # Port was in use - ask for new one
-            if port_error_detected:
-                backend_port = ask_for_port()
-                os.environ['PORT'] = str(backend_port)
-                
-                # Restart with new port
-                print(f"\n🔄 Attempting to start on port {backend_port}...")
-                return start_backend()  # Recursive call with new port
-            else:
-                print("❌ Backend did not start correctly!")
-                return False
-        
-        print(f"✅ Backend started on http://localhost:{backend_port}")
-        return True
-        
+        _launch_backend(listen_socket)
     except Exception as e:
         print(f"❌ Error starting backend: {e}")
         return False
+    
+    print(f"✅ Backend started on http://localhost:{backend_port}")
+    return True
+
+
+def _remove_trees_in_background(paths):
+    """Deletes directory trees in a daemon thread"""
+    def remove():
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+    threading.Thread(target=remove, daemon=True).start()
+
+
+def _discard_directory(path):
+    """Moves a directory out of the way and deletes it in a background thread"""
+    trash = path.with_name(f"{path.name}.trash-{os.getpid()}-{time.time_ns()}")
+    path.rename(trash)
+    _remove_trees_in_background([trash])
+
+
+def _sweep_discarded(frontend_dir):
+    """Deletes node_modules left half-removed by an earlier run that exited mid-delete"""
+    stale = [path for path in frontend_dir.glob('node_modules.trash-*') if path.is_dir()]
+    if stale:
+        _remove_trees_in_background(stale)
+
+
+def _lockfile_hash(frontend_dir):
+    try:
+        return hashlib.sha256((frontend_dir / 'package-lock.json').read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def frontend_dependencies_current(frontend_dir):
+    """Checks node_modules against the package-lock.json it was installed from, without npm"""
+    node_modules = frontend_dir / 'node_modules'
+    if not node_modules.is_dir():
+        return False
+    stamp = node_modules / _LOCK_HASH_STAMP
+    current = _lockfile_hash(frontend_dir)
+    try:
+        return stamp.read_text(encoding='utf-8') == current
+    except FileNotFoundError:
+        # Installed before stamps were written - trust it and start tracking
+        _write_lock_stamp(frontend_dir, current)
+        return True
+    except OSError:
+        return True
+
+
+def _write_lock_stamp(frontend_dir, lock_hash):
+    if not lock_hash:
+        return
+    try:
+        (frontend_dir / 'node_modules' / _LOCK_HASH_STAMP).write_text(lock_hash, encoding='utf-8')
+    except OSError:
+        pass  # Best-effort; the next start simply reinstalls
+
+
+def install_frontend_dependencies(frontend_dir, timeout):
+    """Installs frontend dependencies, streaming npm output; returns True on success"""
+    global install_process
+    
+    # npm ci skips dependency resolution but needs a lockfile
+    has_lockfile = (frontend_dir / 'package-lock.json').exists()
+    kwargs = {} if _IS_WIN else {'preexec_fn': os.setsid}
+    install_process = subprocess.Popen(
+        ['npm', 'ci' if has_lockfile else 'install', '--prefer-offline', '--no-audit', '--no-fund'],
+        cwd=str(frontend_dir),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        **kwargs
+    )
+    output_monitor.attach(install_process, 'NPM')
+    try:
+        deadline = time.monotonic() + timeout
+        while install_process.poll() is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print("❌ Dependency installation timeout exceeded")
+                _signal_process_group(install_process, getattr(signal, 'SIGKILL', signal.SIGTERM))
+                install_process.wait()
+                return False
+            output_monitor.pump(remaining)
+    finally:
+        output_monitor.detach(install_process)
+    
+    if install_process.returncode != 0:
+        print(f"   npm exited with code {install_process.returncode}")
+        return False
+    
+    _write_lock_stamp(frontend_dir, _lockfile_hash(frontend_dir))
+    return True
 
 
 def fix_rollup_dependencies(frontend_dir):
@@ -269,24 +614,16 @@ def fix_rollup_dependencies(frontend_dir):
             package_lock.unlink()
             print("   ✓ Removed package-lock.json")
         
-        # Remove node_modules
+        # Remove node_modules (deleted in the background while npm reinstalls)
         node_modules = frontend_dir / 'node_modules'
         if node_modules.exists():
-            shutil.rmtree(node_modules)
+            _discard_directory(node_modules)
             print("   ✓ Removed node_modules")
         
         # Reinstall dependencies
         print("   📦 Reinstalling dependencies...")
-        install_result = subprocess.run(
-            ['npm', 'install'],
-            cwd=str(frontend_dir),
-            capture_output=True,
-            text=True,
-            timeout=180
-        )
-        
-        if install_result.returncode != 0:
-            print(f"❌ Error during reinstallation:\n{install_result.stderr}")
+        if not install_frontend_dependencies(frontend_dir, timeout=180):
+            print("❌ Error during reinstallation")
             return False
         
         print("✅ Dependencies fixed")
@@ -297,181 +634,183 @@ def fix_rollup_dependencies(frontend_dir):
         return False
 
 
-def start_frontend():
-    """Starts npm dev server"""
+def _ensure_bin_executable(bin_dir):
+    """Makes node_modules/.bin entries executable (lost e.g. when copied from Windows)"""
+    vite = bin_dir / 'vite'
+    if _IS_WIN or os.access(vite, os.X_OK) or not bin_dir.exists():
+        return  # Already fine - skip the scan
+    try:
+        with os.scandir(bin_dir) as entries:
+            for entry in entries:
+                # .bin entries are usually symlinks; chmod applies to the target
+                if entry.is_file():
+                    os.chmod(entry.path, 0o755)
+    except OSError:
+        pass  # Ignore permission errors
+
+
+def _launch_frontend(frontend_dir):
+    """Spawns the npm dev server once; returns 'ok', 'rollup_error' or 'failed'"""
     global frontend_process
     
-    frontend_dir = Path(__file__).parent / 'frontend'
+    # Ustaw zmienną środowiskową dla portu backendu
+    frontend_env = os.environ.copy()
+    frontend_env['VITE_BACKEND_PORT'] = str(backend_port)
+    frontend_env['BACKEND_PORT'] = str(backend_port)
     
-    if not frontend_dir.exists():
+    # Set new process group for frontend (Unix only)
+    kwargs = {}
+    if not _IS_WIN:
+        kwargs['preexec_fn'] = os.setsid
+    
+    frontend_process = subprocess.Popen(
+        ['npm', 'run', 'dev'],
+        cwd=str(frontend_dir),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=frontend_env,
+        **kwargs
+    )
+    
+    # Collect output and detect rollup errors and frontend port
+    output_lines = []
+    rollup_error_detected = False
+    frontend_port = None
+    network_address = None
+    
+    def on_frontend_line(line):
+        nonlocal rollup_error_detected, frontend_port, network_address
+        output_lines.append(line)
+        
+        # Detect frontend port and network address from Vite output;
+        # the substring tests keep the regexes off ordinary HMR lines
+        if 'Local:' in line:
+            port_match = _LOCAL_RE.search(line)
+            if port_match:
+                frontend_port = int(port_match.group(1))
+        
+        if 'Network:' in line:
+            network_match = _NETWORK_RE.search(line)
+            if network_match:
+                network_address = f"http://{network_match.group(1)}:{network_match.group(2)}"
+        
+        # Detect rollup errors
+        if _is_rollup_error(line.lower()):
+            rollup_error_detected = True
+    
+    output_monitor.attach(frontend_process, 'FRONTEND', on_frontend_line)
+    
+    # Wait a moment to check if process started or error occurred
+    # Give more time to detect rollup error
+    deadline = time.monotonic() + 6
+    while frontend_process.poll() is None and not rollup_error_detected:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        output_monitor.pump(remaining)
+    
+    # Check if process exited (error) or rollup error detected
+    process_exited = frontend_process.poll() is not None
+    
+    # If process exited, check output even if error wasn't detected in real-time
+    if process_exited:
+        output_monitor.flush(frontend_process)
+    if process_exited and not rollup_error_detected:
+        if _is_rollup_error('\n'.join(output_lines).lower()):
+            rollup_error_detected = True
+    
+    if process_exited or rollup_error_detected:
+        # If process still running but rollup error detected, stop it
+        if not process_exited and rollup_error_detected:
+            frontend_process.terminate()
+            try:
+                frontend_process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                frontend_process.kill()
+        output_monitor.detach(frontend_process)
+        
+        if rollup_error_detected:
+            return 'rollup_error'
+        
+        # Process exited with other error
+        print("❌ Frontend did not start correctly!")
+        if output_lines:
+            print("   Last output lines:")
+            for line in output_lines[-5:]:
+                print(f"   {line}")
+        return 'failed'
+    
+    # Display port information
+    if frontend_port:
+        print(f"✅ Frontend started on http://localhost:{frontend_port}")
+        if network_address:
+            print(f"   Also available at: {network_address}")
+        print(f"   Backend running on http://localhost:{backend_port}")
+        print(f"\n   🌐 Open in browser:")
+        print(f"      Local: http://localhost:{frontend_port}")
+        if network_address:
+            print(f"      Network: {network_address}")
+    else:
+        print("✅ Frontend started (check port in output above)")
+        print(f"   Backend running on http://localhost:{backend_port}")
+    return 'ok'
+
+
+def start_frontend():
+    """Starts npm dev server"""
+    if not _FRONTEND_DIR.exists():
         print("❌ Frontend directory does not exist!")
         return False
     
-    # Check if node_modules exists
-    if not (frontend_dir / 'node_modules').exists():
-        print("⚠️  node_modules not found. Installing dependencies...")
+    _sweep_discarded(_FRONTEND_DIR)
+    
+    # Install dependencies if node_modules is missing or package-lock.json changed
+    if not frontend_dependencies_current(_FRONTEND_DIR):
+        print("⚠️  Frontend dependencies missing or outdated. Installing dependencies...")
         try:
-            install_result = subprocess.run(
-                ['npm', 'install'],
-                cwd=str(frontend_dir),
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            if install_result.returncode != 0:
-                print(f"❌ Error installing dependencies:\n{install_result.stderr}")
+            if not install_frontend_dependencies(_FRONTEND_DIR, timeout=120):
+                print("❌ Error installing dependencies")
                 return False
             print("✅ Dependencies installed")
-        except subprocess.TimeoutExpired:
-            print("❌ Dependency installation timeout exceeded")
-            return False
         except Exception as e:
             print(f"❌ Error during installation: {e}")
             return False
     
     # Fix permissions for vite and other binaries if needed
-    bin_dir = frontend_dir / 'node_modules' / '.bin'
-    if bin_dir.exists():
-        try:
-            # Fix permissions for all files in .bin
-            for bin_file in bin_dir.iterdir():
-                if bin_file.is_file():
-                    os.chmod(bin_file, 0o755)
-        except Exception:
-            pass  # Ignore permission errors
-    
-    print("🚀 Starting frontend (npm)...")
+    _ensure_bin_executable(_FRONTEND_DIR / 'node_modules' / '.bin')
     
-    try:
-        # Ustaw zmienną środowiskową dla portu backendu
-        frontend_env = os.environ.copy()
-        frontend_env['VITE_BACKEND_PORT'] = str(backend_port)
-        frontend_env['BACKEND_PORT'] = str(backend_port)
-        
-        # Set new process group for frontend (Unix only)
-        kwargs = {}
-        if sys.platform != 'win32':
-            kwargs['preexec_fn'] = os.setsid
-        
-        frontend_process = subprocess.Popen(
-            ['npm', 'run', 'dev'],
-            cwd=str(frontend_dir),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
-            env=frontend_env,
-            **kwargs
-        )
-        
-        # Collect output and detect rollup errors and frontend port
-        output_lines = []
-        rollup_error_detected = False
-        frontend_port = None
-        network_address = None
-        
-        def collect_frontend_output():
-            nonlocal rollup_error_detected, frontend_port, network_address
-            if frontend_process and frontend_process.stdout:
-                for line in iter(frontend_process.stdout.readline, ''):
-                    if line:
-                        output_lines.append(line.rstrip())
-                        print(f"[FRONTEND] {line.rstrip()}")
-                        
-                        # Detect frontend port from Vite output
-                        # Format: "➜  Local:   http://localhost:3001/"
-                        import re
-                        port_match = re.search(r'Local:\s+http://localhost:(\d+)', line)
-                        if port_match:
-                            frontend_port = int(port_match.group(1))
-                        
-                        # Detect network address from Vite output
-                        # Format: "➜  Network: http://192.168.0.58:3001/"
-                        network_match = re.search(r'Network:\s+http://([\d.]+):(\d+)', line)
-                        if network_match:
-                            network_address = f"http://{network_match.group(1)}:{network_match.group(2)}"
-                        
-                        # Detect rollup errors
-                        line_lower = line.lower()
-                        if ('@rollup/rollup' in line_lower and 'cannot find module' in line_lower) or \
-                           ('rollup-linux' in line_lower and 'cannot find module' in line_lower) or \
-                           ('npm has a bug related to optional dependencies' in line_lower) or \
-                           ('@rollup/rollup-linux-x64-gnu' in line_lower):
-                            rollup_error_detected = True
-        
-        import threading
-        frontend_thread = threading.Thread(target=collect_frontend_output, daemon=True)
-        frontend_thread.start()
-        
-        # Wait a moment to check if process started or error occurred
-        # Give more time to detect rollup error
-        max_wait_time = 6
-        waited = 0
-        while waited < max_wait_time and frontend_process.poll() is None and not rollup_error_detected:
-            time.sleep(0.5)
-            waited += 0.5
+    for attempt in range(MAX_START_ATTEMPTS):
+        if attempt:
+            print("\n🔄 Attempting to restart frontend...")
+        print("🚀 Starting frontend (npm)...")
         
-        # Check if process exited (error) or rollup error detected
-        process_exited = frontend_process.poll() is not None
-        
-        # If process exited, check output even if error wasn't detected in real-time
-        if process_exited and not rollup_error_detected:
-            output_text = '\n'.join(output_lines).lower()
-            if ('@rollup/rollup' in output_text and 'cannot find module' in output_text) or \
-               ('rollup-linux' in output_text and 'cannot find module' in output_text) or \
-               ('npm has a bug related to optional dependencies' in output_text) or \
-               ('@rollup/rollup-linux-x64-gnu' in output_text):
-                rollup_error_detected = True
-        
-        if process_exited or rollup_error_detected:
-            # If process still running but rollup error detected, stop it
-            if not process_exited and rollup_error_detected:
-                frontend_process.terminate()
-                try:
-                    frontend_process.wait(timeout=2)
-                except subprocess.TimeoutExpired:
-                    frontend_process.kill()
-            
-            # Rollup error detected - fix dependencies and try again
-            if rollup_error_detected:
-                if fix_rollup_dependencies(frontend_dir):
-                    print("\n🔄 Attempting to restart frontend...")
-                    return start_frontend()  # Recursive call after fix
-                else:
-                    print("❌ Failed to fix rollup dependencies")
-                    return False
-            elif process_exited:
-                # Process exited with other error
-                print("❌ Frontend did not start correctly!")
-                if output_lines:
-                    print("   Last output lines:")
-                    for line in output_lines[-5:]:
-                        print(f"   {line}")
-                return False
+        try:
+            status = _launch_frontend(_FRONTEND_DIR)
+        except Exception as e:
+            print(f"❌ Error starting frontend: {e}")
+            return False
         
-        # Display port information
-        if frontend_port:
-            print(f"✅ Frontend started on http://localhost:{frontend_port}")
-            if network_address:
-                print(f"   Also available at: {network_address}")
-            print(f"   Backend running on http://localhost:{backend_port}")
-            print(f"\n   🌐 Open in browser:")
-            print(f"      Local: http://localhost:{frontend_port}")
-            if network_address:
-                print(f"      Network: {network_address}")
-        else:
-            print("✅ Frontend started (check port in output above)")
-            print(f"   Backend running on http://localhost:{backend_port}")
-        return True
+        if status != 'rollup_error':
+            return status == 'ok'
+        if attempt == MAX_START_ATTEMPTS - 1:
+            break
         
-    except Exception as e:
-        print(f"❌ Error starting frontend: {e}")
-        return False
+        # Rollup error detected - fix dependencies and try again
+        if not fix_rollup_dependencies(_FRONTEND_DIR):
+            print("❌ Failed to fix rollup dependencies")
+            return False
+    
+    print(f"❌ Frontend still failing after {MAX_START_ATTEMPTS} attempts")
+    return False
 
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Start the DockerPilot Extras backend and frontend.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="re-check Node.js/npm even if they are unchanged since the last run")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("DockerPilot Extras - Loader")
     print("=" * 60)
@@ -482,7 +821,7 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     # Check dependencies
-    if not check_dependencies():
+    if not check_dependencies(use_cache=not args.no_cache):
         sys.exit(1)
     
     print()
@@ -510,17 +849,18 @@ def main():
     
     # Wait for termination (or interruption)
     try:
-        while True:
-            # Check if processes are still running
-            if backend_process and backend_process.poll() is not None:
+        if frontend_ok:
+            exited = output_monitor.wait_for_exit([frontend_process], [backend_thread])
+            if exited is backend_thread:
                 print("\n⚠️  Backend terminated unexpectedly")
-                break
-            
-            if frontend_process and frontend_process.poll() is not None:
+            else:
                 print("\n⚠️  Frontend terminated unexpectedly")
-                break
-            
-            time.sleep(1)
+        else:
+            # Only the backend is running - wait for Ctrl+C
+            while backend_thread.is_alive():
+                # join() without a timeout is not interruptible on Windows
+                backend_thread.join(1 if _IS_WIN else None)
+            print("\n⚠️  Backend terminated unexpectedly")
     except KeyboardInterrupt:
         pass
     
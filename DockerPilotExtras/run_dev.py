@@ -12,10 +12,28 @@ from pathlib import Path
 os.environ.setdefault('FLASK_ENV', 'development')
 os.environ.setdefault('PORT', '5000')
 
+_BACKEND_DIR = Path(__file__).resolve().parent / 'backend'
+
+
+def make_dev_server(listen_socket, debug):
+    """Creates a threaded werkzeug server for the Flask app on a bound, listening socket.
+
+    Used by loader.py to serve the backend from its own process; there is no
+    reloader because the loader supervises the server.
+    """
+    from werkzeug.debug import DebuggedApplication
+    from werkzeug.serving import make_server
+    from backend.app import app
+    
+    app.debug = debug
+    wsgi_app = DebuggedApplication(app, evalex=True) if debug else app
+    host, port = listen_socket.getsockname()[:2]
+    return make_server(host, port, wsgi_app, threaded=True, fd=listen_socket.fileno())
+
+
 if __name__ == '__main__':
-    # Change to backend directory
-    backend_dir = Path(__file__).parent / 'backend'
-    sys.path.insert(0, str(backend_dir.parent))
+    # Make the backend package importable
+    sys.path.insert(0, str(_BACKEND_DIR.parent))
     
     # Import and run Flask app
     from backend.app import app
@@ -30,4 +48,3 @@ if __name__ == '__main__':
     print(f"\nPress Ctrl+C to stop")
     
     app.run(host='0.0.0.0', port=port, debug=debug)
-
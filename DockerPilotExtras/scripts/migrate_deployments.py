@@ -5,22 +5,67 @@ Moves configs from various locations to ~/.dockerpilot_extras/deployments/{conta
 """
 
 import os
-import json
-import yaml
 import shutil
+import sys
 from pathlib import Path
 from datetime import datetime
 import hashlib
-import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Add DockerPilotExtras to path to import the shared utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.json_io import dumps as _dumps, loads as _loads
+from utils.naming import safe_name as _safe_name
+
+_ENVIRONMENTS = ('dev', 'staging', 'prod')
+_ENV_CONFIG_NAMES = frozenset(f'deployment-{env}.yml' for env in _ENVIRONMENTS)
 
 def generate_deployment_id(container_name: str, image_tag: str = None) -> str:
     """Generate unique deployment identifier"""
     timestamp = datetime.now().isoformat()
-    hash_input = f"{container_name}_{image_tag or 'latest'}_{timestamp}"
-    hash_value = hashlib.sha256(hash_input.encode()).hexdigest()[:12]
-    safe_name = re.sub(r'[^a-zA-Z0-9_-]', '_', container_name.lower())
+    # image_tag may come from YAML as a number, hence str()
+    hash_input = b'_'.join((
+        container_name.encode(),
+        str(image_tag or 'latest').encode(),
+        timestamp.encode('ascii'),
+    ))
+    hash_value = hashlib.blake2b(hash_input, digest_size=6).hexdigest()
     unique_id = f"{hash_value[:4]}!{hash_value[4:8]}{hash_value[8:12]}"
-    return f"{safe_name}_{unique_id}"
+    return f"{_safe_name(container_name)}_{unique_id}"
+
+def load_config(config_path) -> dict:
+    """Parse one deployment YAML, treating an empty file as an empty config"""
+    # PyYAML is imported on first use so loading this module stays cheap
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
+
+    # Handing libyaml the raw bytes lets it decode in C rather than
+    # pulling text through a Python file object
+    return yaml.load(Path(config_path).read_bytes(), Loader=SafeLoader) or {}
+
+def read_deployment_metadata(deployments_dir: Path) -> dict:
+    """Load every readable deployments/*/metadata.json, keyed by its path"""
+    existing = {}
+    for existing_dir in deployments_dir.iterdir():
+        metadata_path = existing_dir / 'metadata.json'
+        try:
+            existing[metadata_path] = _loads(metadata_path.read_bytes())
+        except (OSError, ValueError):
+            continue
+    return existing
+
+def index_deployments(existing_metadata: dict) -> dict:
+    """Map lowercased container names to their existing deployment directories"""
+    name_index = {}
+    for metadata_path, metadata in existing_metadata.items():
+        container_name = metadata.get('container_name', '')
+        if container_name:
+            name_index.setdefault(container_name.lower(), metadata_path.parent)
+    return name_index
 
 def migrate_deployment_configs():
     """Migrate deployment configs to new structure"""
@@ -40,157 +85,180 @@ def migrate_deployment_configs():
     print("🔄 Migrating deployment configs to unified structure...")
     print(f"📁 Target directory: {deployments_dir}\n")
     
-    # Find all deployment configs
+    # Existing deployments by container name, kept current as dirs are created
+    metadata_cache = read_deployment_metadata(deployments_dir)
+    name_index = index_deployments(metadata_cache)
+    migrated_at = datetime.now().isoformat()
+    # metadata.json contents by path, written once each after all configs are placed
+    staged_metadata = {}
+    
+    # One directory listing per location drives all the checks below
+    listings = []
     for location in locations:
-        if not location.exists():
+        try:
+            with os.scandir(location) as it:
+                listings.append({entry.name: entry for entry in it if entry.is_file()})
+        except OSError:
             continue
-        
+    
+    # Parse every candidate config up front; placing them into deployment
+    # dirs stays sequential because later configs reuse earlier dirs
+    candidates = [
+        entry.path
+        for entries in listings
+        for name, entry in entries.items()
+        if name in _ENV_CONFIG_NAMES or name == 'deployment.yml' or name.endswith('-deployment.yml')
+    ]
+    with ThreadPoolExecutor(max_workers=min(8, len(candidates) or 1)) as pool:
+        pending = {path: pool.submit(load_config, path) for path in candidates}
+    
+    # Find all deployment configs
+    for entries in listings:
         # Check for deployment-{env}.yml files
-        for env in ['dev', 'staging', 'prod']:
-            config_path = location / f'deployment-{env}.yml'
-            if config_path.exists():
+        for env in _ENVIRONMENTS:
+            entry = entries.get(f'deployment-{env}.yml')
+            if entry:
+                config_path = Path(entry.path)
                 try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        config = yaml.safe_load(f) or {}
-                        container_name = config.get('deployment', {}).get('container_name', '')
-                        image_tag = config.get('deployment', {}).get('image_tag', 'latest')
-                        
-                        if container_name:
-                            # Create deployment directory
-                            deployment_id = generate_deployment_id(container_name, image_tag)
-                            deployment_dir = deployments_dir / deployment_id
-                            deployment_dir.mkdir(exist_ok=True, parents=True)
-                            
-                            # Copy config
-                            dest_path = deployment_dir / f'deployment-{env}.yml'
-                            shutil.copy2(config_path, dest_path)
-                            
-                            # Create/update metadata
-                            metadata_path = deployment_dir / 'metadata.json'
-                            if metadata_path.exists():
-                                with open(metadata_path, 'r', encoding='utf-8') as f:
-                                    metadata = json.load(f)
-                            else:
-                                metadata = {
-                                    'container_name': container_name,
-                                    'image_tag': image_tag,
-                                    'created_at': datetime.now().isoformat(),
-                                    'deployment_id': deployment_id,
-                                    'migrated_from': str(config_path)
-                                }
-                            
-                            metadata['last_updated'] = datetime.now().isoformat()
-                            metadata[f'env_{env}_config'] = str(dest_path)
-                            
-                            with open(metadata_path, 'w', encoding='utf-8') as f:
-                                json.dump(metadata, f, indent=2)
-                            
-                            migrated.append(f"{config_path} -> {deployment_dir.name}/deployment-{env}.yml")
-                            print(f"✓ Migrated: {config_path.name} -> {deployment_dir.name}/")
-                        else:
-                            skipped.append(f"{config_path} (missing container_name)")
-                except Exception as e:
-                    skipped.append(f"{config_path} (error: {e})")
-        
-        # Check for main deployment.yml
-        main_config_path = location / 'deployment.yml'
-        if main_config_path.exists():
-            try:
-                with open(main_config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f) or {}
+                    config = pending[entry.path].result()
                     container_name = config.get('deployment', {}).get('container_name', '')
                     image_tag = config.get('deployment', {}).get('image_tag', 'latest')
                     
                     if container_name:
-                        # Check if deployment directory already exists
-                        deployment_dir = None
-                        for existing_dir in deployments_dir.iterdir():
-                            if existing_dir.is_dir():
-                                metadata_path = existing_dir / 'metadata.json'
-                                if metadata_path.exists():
-                                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                                        metadata = json.load(f)
-                                        if metadata.get('container_name', '').lower() == container_name.lower():
-                                            deployment_dir = existing_dir
-                                            break
-                        
-                        if not deployment_dir:
-                            deployment_id = generate_deployment_id(container_name, image_tag)
-                            deployment_dir = deployments_dir / deployment_id
-                            deployment_dir.mkdir(exist_ok=True, parents=True)
+                        # Create deployment directory
+                        deployment_id = generate_deployment_id(container_name, image_tag)
+                        deployment_dir = deployments_dir / deployment_id
+                        deployment_dir.mkdir(exist_ok=True, parents=True)
                         
                         # Copy config
-                        dest_path = deployment_dir / 'deployment.yml'
-                        shutil.copy2(main_config_path, dest_path)
+                        dest_path = deployment_dir / f'deployment-{env}.yml'
+                        shutil.copyfile(config_path, dest_path)
                         
-                        # Update metadata
+                        # Create/update metadata
                         metadata_path = deployment_dir / 'metadata.json'
-                        if metadata_path.exists():
-                            with open(metadata_path, 'r', encoding='utf-8') as f:
-                                metadata = json.load(f)
+                        if metadata_path in metadata_cache:
+                            metadata = metadata_cache[metadata_path]
+                        elif metadata_path.exists():
+                            metadata = _loads(metadata_path.read_bytes())
                         else:
                             metadata = {
                                 'container_name': container_name,
                                 'image_tag': image_tag,
-                                'created_at': datetime.now().isoformat(),
-                                'deployment_id': deployment_dir.name,
-                                'migrated_from': str(main_config_path)
+                                'created_at': migrated_at,
+                                'deployment_id': deployment_id,
+                                'migrated_from': str(config_path)
                             }
                         
-                        metadata['last_updated'] = datetime.now().isoformat()
-                        metadata['main_config'] = str(dest_path)
+                        metadata['last_updated'] = migrated_at
+                        metadata[f'env_{env}_config'] = str(dest_path)
                         
-                        with open(metadata_path, 'w', encoding='utf-8') as f:
-                            json.dump(metadata, f, indent=2)
+                        metadata_cache[metadata_path] = staged_metadata[metadata_path] = metadata
+                        name_index.setdefault(container_name.lower(), deployment_dir)
                         
-                        migrated.append(f"{main_config_path} -> {deployment_dir.name}/deployment.yml")
-                        print(f"✓ Migrated: {main_config_path.name} -> {deployment_dir.name}/")
+                        migrated.append(f"{config_path} -> {deployment_dir.name}/deployment-{env}.yml")
+                        print(f"✓ Migrated: {config_path.name} -> {deployment_dir.name}/")
+                    else:
+                        skipped.append(f"{config_path} (missing container_name)")
+                except Exception as e:
+                    skipped.append(f"{config_path} (error: {e})")
+        
+        # Check for main deployment.yml
+        entry = entries.get('deployment.yml')
+        if entry:
+            main_config_path = Path(entry.path)
+            try:
+                config = pending[entry.path].result()
+                container_name = config.get('deployment', {}).get('container_name', '')
+                image_tag = config.get('deployment', {}).get('image_tag', 'latest')
+                
+                if container_name:
+                    # Check if deployment directory already exists
+                    name_key = container_name.lower()
+                    deployment_dir = name_index.get(name_key)
+                    
+                    if not deployment_dir:
+                        deployment_id = generate_deployment_id(container_name, image_tag)
+                        deployment_dir = deployments_dir / deployment_id
+                        deployment_dir.mkdir(exist_ok=True, parents=True)
+                        name_index[name_key] = deployment_dir
+                    
+                    # Copy config
+                    dest_path = deployment_dir / 'deployment.yml'
+                    shutil.copyfile(main_config_path, dest_path)
+                    
+                    # Update metadata
+                    metadata_path = deployment_dir / 'metadata.json'
+                    if metadata_path in metadata_cache:
+                        metadata = metadata_cache[metadata_path]
+                    elif metadata_path.exists():
+                        metadata = _loads(metadata_path.read_bytes())
                     else:
-                        skipped.append(f"{main_config_path} (missing container_name)")
+                        metadata = {
+                            'container_name': container_name,
+                            'image_tag': image_tag,
+                            'created_at': migrated_at,
+                            'deployment_id': deployment_dir.name,
+                            'migrated_from': str(main_config_path)
+                        }
+                    
+                    metadata['last_updated'] = migrated_at
+                    metadata['main_config'] = str(dest_path)
+                    
+                    metadata_cache[metadata_path] = staged_metadata[metadata_path] = metadata
+                    
+                    migrated.append(f"{main_config_path} -> {deployment_dir.name}/deployment.yml")
+                    print(f"✓ Migrated: {main_config_path.name} -> {deployment_dir.name}/")
+                else:
+                    skipped.append(f"{main_config_path} (missing container_name)")
             except Exception as e:
                 skipped.append(f"{main_config_path} (error: {e})")
         
         # Check for named configs (e.g., grafana-deployment.yml)
-        if hasattr(location, 'glob'):
-            for config_path in location.glob('*-deployment.yml'):
-                if 'deployment-dev.yml' in str(config_path) or 'deployment-staging.yml' in str(config_path) or 'deployment-prod.yml' in str(config_path):
-                    continue  # Already processed
+        # (the deployment-{env}.yml files handled above never end in -deployment.yml)
+        for name, entry in entries.items():
+            if name.endswith('-deployment.yml'):
+                config_path = Path(entry.path)
                 
                 try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        config = yaml.safe_load(f) or {}
-                        container_name = config.get('deployment', {}).get('container_name', '')
-                        image_tag = config.get('deployment', {}).get('image_tag', 'latest')
+                    config = pending[entry.path].result()
+                    container_name = config.get('deployment', {}).get('container_name', '')
+                    image_tag = config.get('deployment', {}).get('image_tag', 'latest')
+                    
+                    if container_name:
+                        deployment_id = generate_deployment_id(container_name, image_tag)
+                        deployment_dir = deployments_dir / deployment_id
+                        deployment_dir.mkdir(exist_ok=True, parents=True)
                         
-                        if container_name:
-                            deployment_id = generate_deployment_id(container_name, image_tag)
-                            deployment_dir = deployments_dir / deployment_id
-                            deployment_dir.mkdir(exist_ok=True, parents=True)
-                            
-                            # Copy config
-                            dest_path = deployment_dir / 'deployment.yml'
-                            shutil.copy2(config_path, dest_path)
-                            
-                            # Create metadata
-                            metadata = {
-                                'container_name': container_name,
-                                'image_tag': image_tag,
-                                'created_at': datetime.now().isoformat(),
-                                'deployment_id': deployment_id,
-                                'migrated_from': str(config_path)
-                            }
-                            
-                            metadata_path = deployment_dir / 'metadata.json'
-                            with open(metadata_path, 'w', encoding='utf-8') as f:
-                                json.dump(metadata, f, indent=2)
-                            
-                            migrated.append(f"{config_path} -> {deployment_dir.name}/deployment.yml")
-                            print(f"✓ Migrated: {config_path.name} -> {deployment_dir.name}/")
-                        else:
-                            skipped.append(f"{config_path} (missing container_name)")
+                        # Copy config
+                        dest_path = deployment_dir / 'deployment.yml'
+                        shutil.copyfile(config_path, dest_path)
+                        
+                        # Create metadata
+                        metadata = {
+                            'container_name': container_name,
+                            'image_tag': image_tag,
+                            'created_at': migrated_at,
+                            'deployment_id': deployment_id,
+                            'migrated_from': str(config_path)
+                        }
+                        
+                        metadata_path = deployment_dir / 'metadata.json'
+                        metadata_cache[metadata_path] = staged_metadata[metadata_path] = metadata
+                        name_index.setdefault(container_name.lower(), deployment_dir)
+                        
+                        migrated.append(f"{config_path} -> {deployment_dir.name}/deployment.yml")
+                        print(f"✓ Migrated: {config_path.name} -> {deployment_dir.name}/")
+                    else:
+                        skipped.append(f"{config_path} (missing container_name)")
                 except Exception as e:
                     skipped.append(f"{config_path} (error: {e})")
     
+    for metadata_path, metadata in staged_metadata.items():
+        try:
+            metadata_path.write_bytes(_dumps(metadata))
+        except OSError as e:
+            skipped.append(f"{metadata_path} (error: {e})")
+    
     print(f"\n✅ Migration completed!")
     print(f"📊 Migrated: {len(migrated)} configs")
     if skipped:
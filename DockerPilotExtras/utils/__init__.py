@@ -2,7 +2,13 @@
 Utility modules for DockerPilot Extras
 """
 
-from .pipeline_generator import PipelineGenerator, parse_env_vars
-
 __all__ = ['PipelineGenerator', 'parse_env_vars']
 
+
+def __getattr__(name):
+    # Imported on first use so the standalone scripts can share utils.json_io
+    # without pulling in PyYAML through pipeline_generator
+    if name in __all__:
+        from . import pipeline_generator
+        return getattr(pipeline_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,20 @@
+"""
+JSON reading and writing for deployment metadata, using orjson when installed
+"""
+
+import json
+
+try:
+    import orjson
+
+    def loads(data: bytes):
+        return orjson.loads(data)
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson is optional; stdlib json writes the same bytes
+    def loads(data: bytes):
+        return json.loads(data)
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,23 @@
+"""
+Container-name helpers shared by the deployment scripts
+"""
+
+
+class _SafeNameChars(dict):
+    """str.translate table mapping anything outside [a-zA-Z0-9_-] to '_'"""
+
+    def __missing__(self, code):
+        char = chr(code)
+        safe = char if char.isascii() and (char.isalnum() or char in '_-') else '_'
+        self[code] = safe
+        return safe
+
+_SAFE_NAME_CHARS = _SafeNameChars()
+
+
+def safe_name(container_name):
+    """Lowercased container name with anything outside [a-z0-9_-] replaced by '_'
+
+    This is the prefix of a container's deployment directory names.
+    """
+    return container_name.lower().translate(_SAFE_NAME_CHARS)
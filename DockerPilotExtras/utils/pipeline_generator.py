@@ -2,8 +2,59 @@
 Utility module for pipeline generation
 """
 
+import re
 import yaml
-from typing import Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
+
+# KEY=VALUE per line, split at the first '=' with surrounding whitespace trimmed
+_ENV_LINE = re.compile(r"^[^\S\n]*([^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.M)
+
+# (env, GitLab environment, URL host prefix, branches, manual, dockerpilot command)
+_DEPLOY_ENVIRONMENTS = (
+    ("dev", "development", "dev.", ("develop",), False, "deploy config {config} --type rolling"),
+    ("staging", "staging", "staging.", ("staging",), True, "promote dev staging --config {config}"),
+    ("prod", "production", "", ("main", "master"), True, "promote staging prod --config {config}"),
+)
+
+# (stage label, branch, approval prompt, dockerpilot command)
+_JENKINS_DEPLOY_STAGES = (
+    ("DEV", "develop", None, "deploy config {config} --type rolling"),
+    ("STAGING", "staging", "Deploy to STAGING?", "promote dev staging --config {config}"),
+    ("PROD", "main", "Deploy to PRODUCTION?", "promote staging prod --config {config}"),
+)
+
+_JENKINS_TEMPLATE = """pipeline {{
+    agent {{ label '{agent}' }}
+
+    environment {{
+        DOCKER_IMAGE = '{docker_image}'
+        DOCKERFILE = '{dockerfile}'
+{environment}    }}
+
+    stages {{
+{stages}    }}
+
+    post {{
+        success {{
+            echo 'Pipeline succeeded!'
+            archiveArtifacts artifacts: '**/*.log', allowEmptyArchive: true
+        }}
+        failure {{
+            echo 'Pipeline failed!'
+        }}
+        always {{
+            cleanWs()
+        }}
+    }}
+}}
+"""
 
 
 class PipelineGenerator:
@@ -86,6 +137,82 @@ class PipelineGenerator:
         enable_rollback_job: bool = True,
     ) -> str:
         """Generate GitLab CI pipeline YAML."""
+        runner_tags = tuple(runner_tags) if runner_tags is not None else None
+        stages = tuple(stages or ())
+        env_items = tuple((env_vars or {}).items())
+        test_commands = tuple(test_commands) if test_commands else None
+        args = (
+            project_name,
+            docker_image,
+            dockerfile,
+            runner_tags,
+            stages,
+            env_items,
+            deploy_strategy,
+            use_cache,
+            registry_url,
+            enable_environments,
+            deployment_config_path,
+            test_commands,
+            image_tag_strategy,
+            scan_severity,
+            scan_fail_on_findings,
+            smoke_test_url,
+            smoke_test_retries,
+            enable_rollback_job,
+        )
+        return PipelineGenerator._render_gitlab_cached(args, (
+            *(runner_tags or ()), *stages, *(value for item in env_items for value in item), *(test_commands or ()),
+        ))
+
+    @staticmethod
+    def _render_gitlab_cached(args: tuple, items: tuple) -> str:
+        """Render through the cache when args make a sound key, else directly.
+
+        The values come straight from request JSON. typed=True keeps 1 and True
+        apart as arguments but not inside the tuples, so the cache is only used
+        when every list item is a string; lists or dicts cannot be keys at all.
+        """
+        render = PipelineGenerator._render_gitlab_pipeline
+        if all(isinstance(item, str) for item in items):
+            try:
+                hash(args)
+            except TypeError:  # e.g. a dict registry_url
+                pass
+            else:
+                return render(*args)
+        return render.__wrapped__(*args)
+
+    @staticmethod
+    @lru_cache(maxsize=32, typed=True)
+    def _render_gitlab_pipeline(
+        project_name: str,
+        docker_image: str,
+        dockerfile: str,
+        runner_tags: Optional[Tuple[str, ...]],
+        stages: Tuple[str, ...],
+        env_items: Tuple[Tuple[str, str], ...],
+        deploy_strategy: str,
+        use_cache: bool,
+        registry_url: Optional[str],
+        enable_environments: bool,
+        deployment_config_path: str,
+        test_commands: Optional[Tuple[str, ...]],
+        image_tag_strategy: str,
+        scan_severity: str,
+        scan_fail_on_findings: bool,
+        smoke_test_url: Optional[str],
+        smoke_test_retries: int,
+        enable_rollback_job: bool,
+    ) -> str:
+        """Render GitLab CI YAML from hashable arguments.
+
+        Emitting through PyYAML dominates the cost of a pipeline, and the
+        editor regenerates the same settings repeatedly, so the rendered
+        text is cached per distinct input.
+        """
+        runner_tags = list(runner_tags) if runner_tags is not None else None
+        env_vars = dict(env_items)
         normalized_stages = PipelineGenerator._normalize_stages(stages)
         normalized_test_commands = PipelineGenerator._normalize_test_commands(test_commands)
         runtime_repo, runtime_tag = PipelineGenerator._split_image_name(docker_image)
@@ -167,68 +294,38 @@ class PipelineGenerator:
             set_runtime_image = f'RUNTIME_IMAGE="{runtime_repo}:{runtime_tag}"'
 
             if enable_environments:
-                deploy_dev = {
-                    "stage": "deploy",
-                    "tags": runner_tags,
-                    "script": [
-                        tag_assignment,
-                        set_runtime_image,
-                        'docker pull "$CI_REGISTRY_IMAGE:${IMAGE_TAG}"',
-                        'docker tag "$CI_REGISTRY_IMAGE:${IMAGE_TAG}" "${RUNTIME_IMAGE}"',
-                        f"dockerpilot deploy config {deployment_config_path} --type rolling",
-                    ],
-                    "environment": {
-                        "name": "development",
-                        "url": f"https://dev.{project_name}.example.com",
-                    },
-                    "only": ["develop"],
-                }
-                dev_needs = [
-                    stage_name
-                    for stage_name in ["build", "test", "scan"]
-                    if stage_name in normalized_stages
-                ]
-                if dev_needs:
-                    deploy_dev["needs"] = dev_needs
-                pipeline["deploy:dev"] = deploy_dev
-
-                pipeline["deploy:staging"] = {
-                    "stage": "deploy",
-                    "tags": runner_tags,
-                    "script": [
-                        tag_assignment,
-                        set_runtime_image,
-                        'docker pull "$CI_REGISTRY_IMAGE:${IMAGE_TAG}"',
-                        'docker tag "$CI_REGISTRY_IMAGE:${IMAGE_TAG}" "${RUNTIME_IMAGE}"',
-                        f"dockerpilot promote dev staging --config {deployment_config_path}",
-                    ],
-                    "environment": {
-                        "name": "staging",
-                        "url": f"https://staging.{project_name}.example.com",
-                    },
-                    "only": ["staging"],
-                    "when": "manual",
-                    "needs": ["deploy:dev"],
-                }
-
-                pipeline["deploy:prod"] = {
-                    "stage": "deploy",
-                    "tags": runner_tags,
-                    "script": [
-                        tag_assignment,
-                        set_runtime_image,
-                        'docker pull "$CI_REGISTRY_IMAGE:${IMAGE_TAG}"',
-                        'docker tag "$CI_REGISTRY_IMAGE:${IMAGE_TAG}" "${RUNTIME_IMAGE}"',
-                        f"dockerpilot promote staging prod --config {deployment_config_path}",
-                    ],
-                    "environment": {
-                        "name": "production",
-                        "url": f"https://{project_name}.example.com",
-                    },
-                    "only": ["main", "master"],
-                    "when": "manual",
-                    "needs": ["deploy:staging"],
-                }
+                previous_job = None
+                for env, env_name, url_prefix, branches, manual, command in _DEPLOY_ENVIRONMENTS:
+                    job = {
+                        "stage": "deploy",
+                        "tags": runner_tags,
+                        "script": [
+                            tag_assignment,
+                            set_runtime_image,
+                            'docker pull "$CI_REGISTRY_IMAGE:${IMAGE_TAG}"',
+                            'docker tag "$CI_REGISTRY_IMAGE:${IMAGE_TAG}" "${RUNTIME_IMAGE}"',
+                            f"dockerpilot {command.format(config=deployment_config_path)}",
+                        ],
+                        "environment": {
+                            "name": env_name,
+                            "url": f"https://{url_prefix}{project_name}.example.com",
+                        },
+                        "only": list(branches),
+                    }
+                    if manual:
+                        job["when"] = "manual"
+                    if previous_job:
+                        job["needs"] = [previous_job]
+                    else:
+                        upstream = [
+                            stage_name
+                            for stage_name in ["build", "test", "scan"]
+                            if stage_name in normalized_stages
+                        ]
+                        if upstream:
+                            job["needs"] = upstream
+                    previous_job = f"deploy:{env}"
+                    pipeline[previous_job] = job
 
                 if enable_rollback_job:
                     pipeline["rollback:prod"] = {
@@ -248,33 +345,16 @@ class PipelineGenerator:
                     }
 
                 if "smoke" in normalized_stages and smoke_test_url:
-                    pipeline["smoke:dev"] = {
-                        "stage": "smoke",
-                        "tags": runner_tags,
-                        "script": PipelineGenerator._gitlab_smoke_script(
-                            smoke_test_url.replace("{env}", "dev"), smoke_test_retries
-                        ),
-                        "only": ["develop"],
-                        "needs": ["deploy:dev"],
-                    }
-                    pipeline["smoke:staging"] = {
-                        "stage": "smoke",
-                        "tags": runner_tags,
-                        "script": PipelineGenerator._gitlab_smoke_script(
-                            smoke_test_url.replace("{env}", "staging"), smoke_test_retries
-                        ),
-                        "only": ["staging"],
-                        "needs": ["deploy:staging"],
-                    }
-                    pipeline["smoke:prod"] = {
-                        "stage": "smoke",
-                        "tags": runner_tags,
-                        "script": PipelineGenerator._gitlab_smoke_script(
-                            smoke_test_url.replace("{env}", "prod"), smoke_test_retries
-                        ),
-                        "only": ["main", "master"],
-                        "needs": ["deploy:prod"],
-                    }
+                    for env, _, _, branches, _, _ in _DEPLOY_ENVIRONMENTS:
+                        pipeline[f"smoke:{env}"] = {
+                            "stage": "smoke",
+                            "tags": runner_tags,
+                            "script": PipelineGenerator._gitlab_smoke_script(
+                                smoke_test_url.replace("{env}", env), smoke_test_retries
+                            ),
+                            "only": list(branches),
+                            "needs": [f"deploy:{env}"],
+                        }
             else:
                 deploy_script = [
                     tag_assignment,
@@ -312,54 +392,18 @@ class PipelineGenerator:
                         "needs": ["deploy"],
                     }
 
-        return yaml.dump(pipeline, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        return yaml.dump(
+            pipeline,
+            Dumper=SafeDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
 
     @staticmethod
-    def generate_jenkins_pipeline(
-        project_name: str,
-        docker_image: str,
-        dockerfile: str,
-        agent: str,
-        credentials_id: str,
-        stages: List[str],
-        env_vars: Dict[str, str],
-        deploy_strategy: str = "rolling",
-        enable_environments: bool = True,
-        deployment_config_path: str = "deployment.yml",
-        test_commands: Optional[List[str]] = None,
-        scan_severity: str = "HIGH,CRITICAL",
-        scan_fail_on_findings: bool = True,
-        smoke_test_url: Optional[str] = None,
-        smoke_test_retries: int = 10,
-        enable_rollback_job: bool = True,
-    ) -> str:
-        """Generate Jenkins Pipeline (Jenkinsfile)."""
-        normalized_stages = PipelineGenerator._normalize_stages(stages)
-        normalized_test_commands = PipelineGenerator._normalize_test_commands(test_commands)
-        scan_exit_code = 1 if scan_fail_on_findings else 0
-        safe_retries = max(1, int(smoke_test_retries))
-
-        pipeline = f"""pipeline {{
-    agent {{ label '{agent}' }}
-
-    environment {{
-        DOCKER_IMAGE = '{docker_image}'
-        DOCKERFILE = '{dockerfile}'
-"""
-
-        for key, value in env_vars.items():
-            pipeline += f"        {key} = '{value}'\n"
-
-        if smoke_test_url:
-            pipeline += f"        SMOKE_URL = '{smoke_test_url}'\n"
-
-        pipeline += """    }
-
-    stages {
-"""
-
-        if "build" in normalized_stages:
-            pipeline += f"""        stage('Build') {{
+    @lru_cache(maxsize=32)
+    def _jenkins_build_stage(credentials_id: str) -> str:
+        return f"""        stage('Build') {{
             steps {{
                 script {{
                     def image = docker.build("${{DOCKER_IMAGE}}", "-f ${{DOCKERFILE}} .")
@@ -371,61 +415,48 @@ class PipelineGenerator:
         }}
 """
 
-        if "test" in normalized_stages:
-            pipeline += """        stage('Test') {
-            steps {
-"""
-            for command in normalized_test_commands:
-                escaped = command.replace("'", "'\"'\"'")
-                pipeline += f"                sh 'docker run --rm ${{DOCKER_IMAGE}} sh -lc \'{escaped}\''\n"
-            pipeline += """            }
-        }
-"""
-
-        if "scan" in normalized_stages:
-            pipeline += f"""        stage('Scan') {{
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _jenkins_test_stage(test_commands: Tuple[str, ...]) -> str:
+        steps = []
+        for command in test_commands:
+            escaped = command.replace("'", "'\"'\"'")
+            steps.append(f"                sh 'docker run --rm ${{DOCKER_IMAGE}} sh -lc \'{escaped}\''\n")
+        return f"""        stage('Test') {{
             steps {{
-                sh 'docker run --rm -v /var/run/docker.sock:/var/run/docker.sock aquasec/trivy:latest image --severity {scan_severity} --exit-code {scan_exit_code} ${{DOCKER_IMAGE}}'
-            }}
+{"".join(steps)}            }}
         }}
 """
 
-        if "deploy" in normalized_stages:
-            if enable_environments:
-                pipeline += f"""        stage('Deploy to DEV') {{
-            when {{
-                branch 'develop'
-            }}
-            steps {{
-                sh 'docker pull ${{DOCKER_IMAGE}}'
-                sh 'dockerpilot deploy config {deployment_config_path} --type rolling'
-            }}
-        }}
-
-        stage('Deploy to STAGING') {{
-            when {{
-                branch 'staging'
-            }}
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _jenkins_scan_stage(scan_severity: str, scan_exit_code: int) -> str:
+        return f"""        stage('Scan') {{
             steps {{
-                input message: 'Deploy to STAGING?', ok: 'Deploy'
-                sh 'docker pull ${{DOCKER_IMAGE}}'
-                sh 'dockerpilot promote dev staging --config {deployment_config_path}'
+                sh 'docker run --rm -v /var/run/docker.sock:/var/run/docker.sock aquasec/trivy:latest image --severity {scan_severity} --exit-code {scan_exit_code} ${{DOCKER_IMAGE}}'
             }}
         }}
+"""
 
-        stage('Deploy to PROD') {{
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _jenkins_deploy_stages(deployment_config_path: str, enable_rollback_job: bool) -> str:
+        deploy_stages = []
+        for label, branch, prompt, command in _JENKINS_DEPLOY_STAGES:
+            approval = f"                input message: '{prompt}', ok: 'Deploy'\n" if prompt else ""
+            deploy_stages.append(f"""        stage('Deploy to {label}') {{
             when {{
-                branch 'main'
+                branch '{branch}'
             }}
             steps {{
-                input message: 'Deploy to PRODUCTION?', ok: 'Deploy'
-                sh 'docker pull ${{DOCKER_IMAGE}}'
-                sh 'dockerpilot promote staging prod --config {deployment_config_path}'
+{approval}                sh 'docker pull ${{DOCKER_IMAGE}}'
+                sh 'dockerpilot {command.format(config=deployment_config_path)}'
             }}
         }}
-"""
-                if enable_rollback_job:
-                    pipeline += f"""        stage('Rollback PROD') {{
+""")
+        if enable_rollback_job:
+            # Follows the PROD stage directly, without a blank line
+            deploy_stages[-1] += f"""        stage('Rollback PROD') {{
             when {{
                 branch 'main'
             }}
@@ -437,8 +468,12 @@ class PipelineGenerator:
             }}
         }}
 """
-            else:
-                pipeline += f"""        stage('Deploy') {{
+        return "\n".join(deploy_stages)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _jenkins_deploy_stage(deployment_config_path: str, deploy_strategy: str) -> str:
+        return f"""        stage('Deploy') {{
             steps {{
                 sh 'docker pull ${{DOCKER_IMAGE}}'
                 sh 'dockerpilot deploy config {deployment_config_path} --type {deploy_strategy}'
@@ -446,43 +481,102 @@ class PipelineGenerator:
         }}
 """
 
-        if "smoke" in normalized_stages and smoke_test_url:
-            pipeline += f"""        stage('Smoke test') {{
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _jenkins_smoke_stage(retries: int) -> str:
+        return f"""        stage('Smoke test') {{
             steps {{
-                sh 'for i in $(seq 1 {safe_retries}); do curl -fsS "${{SMOKE_URL}}" && exit 0; echo "Smoke attempt $i failed"; sleep 5; done; exit 1'
+                sh 'for i in $(seq 1 {retries}); do curl -fsS "${{SMOKE_URL}}" && exit 0; echo "Smoke attempt $i failed"; sleep 5; done; exit 1'
             }}
         }}
 """
 
-        pipeline += """    }
+    @staticmethod
+    def generate_jenkins_pipeline(
+        project_name: str,
+        docker_image: str,
+        dockerfile: str,
+        agent: str,
+        credentials_id: str,
+        stages: List[str],
+        env_vars: Dict[str, str],
+        deploy_strategy: str = "rolling",
+        enable_environments: bool = True,
+        deployment_config_path: str = "deployment.yml",
+        test_commands: Optional[List[str]] = None,
+        scan_severity: str = "HIGH,CRITICAL",
+        scan_fail_on_findings: bool = True,
+        smoke_test_url: Optional[str] = None,
+        smoke_test_retries: int = 10,
+        enable_rollback_job: bool = True,
+    ) -> str:
+        """Generate Jenkins Pipeline (Jenkinsfile)."""
+        normalized_stages = PipelineGenerator._normalize_stages(stages)
 
-    post {
-        success {
-            echo 'Pipeline succeeded!'
-            archiveArtifacts artifacts: '**/*.log', allowEmptyArchive: true
-        }
-        failure {
-            echo 'Pipeline failed!'
-        }
-        always {
-            cleanWs()
-        }
-    }
-}
-"""
+        environment = "".join(f"        {key} = '{value}'\n" for key, value in env_vars.items())
+        if smoke_test_url:
+            environment += f"        SMOKE_URL = '{smoke_test_url}'\n"
 
-        return pipeline
+        build = test = scan = deploy = smoke = ""
+        if "build" in normalized_stages:
+            build = PipelineGenerator._jenkins_build_stage(credentials_id)
+        if "test" in normalized_stages:
+            test = PipelineGenerator._jenkins_test_stage(
+                tuple(PipelineGenerator._normalize_test_commands(test_commands))
+            )
+        if "scan" in normalized_stages:
+            scan = PipelineGenerator._jenkins_scan_stage(scan_severity, 1 if scan_fail_on_findings else 0)
+        if "deploy" in normalized_stages:
+            if enable_environments:
+                deploy = PipelineGenerator._jenkins_deploy_stages(deployment_config_path, bool(enable_rollback_job))
+            else:
+                deploy = PipelineGenerator._jenkins_deploy_stage(deployment_config_path, deploy_strategy)
+        if "smoke" in normalized_stages and smoke_test_url:
+            smoke = PipelineGenerator._jenkins_smoke_stage(max(1, int(smoke_test_retries)))
+
+        return _JENKINS_TEMPLATE.format_map(
+            {
+                "agent": agent,
+                "docker_image": docker_image,
+                "dockerfile": dockerfile,
+                "environment": environment,
+                "stages": build + test + scan + deploy + smoke,
+            }
+        )
 
 
 def parse_env_vars(env_text: str) -> Dict[str, str]:
     """Parse environment variables from text."""
-    env_vars = {}
-    for line in env_text.strip().split("\n"):
-        line = line.strip()
-        if line and "=" in line:
-            key, value = line.split("=", 1)
-            env_vars[key.strip()] = value.strip()
-    return env_vars
+    return dict(_ENV_LINE.findall(env_text))
+
+
+# Per-environment overrides; shared across calls, so values are copied out
+_ENV_CONFIGS = MappingProxyType({
+    "dev": {
+        "replicas": 1,
+        "cpu_limit": "0.5",
+        "memory_limit": "512m",
+        "image_tag_suffix": "-dev",
+        "port_mapping": {"8080": "8080"},
+        "environment": {"ENV": "development", "LOG_LEVEL": "debug"},
+    },
+    "staging": {
+        "replicas": 2,
+        "cpu_limit": "1.0",
+        "memory_limit": "1g",
+        "image_tag_suffix": "-staging",
+        "port_mapping": {"8080": "8081"},
+        "environment": {"ENV": "staging", "LOG_LEVEL": "info"},
+    },
+    "prod": {
+        "replicas": 3,
+        "cpu_limit": "2.0",
+        "memory_limit": "2g",
+        "image_tag_suffix": "",
+        "port_mapping": {"8080": "8080"},
+        "environment": {"ENV": "production", "LOG_LEVEL": "warn"},
+    },
+})
 
 
 def generate_deployment_config_for_environment(
@@ -493,37 +587,10 @@ def generate_deployment_config_for_environment(
 ) -> Dict:
     """Generate deployment configuration for specific environment."""
 
-    env_configs = {
-        "dev": {
-            "replicas": 1,
-            "cpu_limit": "0.5",
-            "memory_limit": "512m",
-            "image_tag_suffix": "-dev",
-            "port_mapping": {"8080": "8080"},
-            "environment": {"ENV": "development", "LOG_LEVEL": "debug"},
-        },
-        "staging": {
-            "replicas": 2,
-            "cpu_limit": "1.0",
-            "memory_limit": "1g",
-            "image_tag_suffix": "-staging",
-            "port_mapping": {"8080": "8081"},
-            "environment": {"ENV": "staging", "LOG_LEVEL": "info"},
-        },
-        "prod": {
-            "replicas": 3,
-            "cpu_limit": "2.0",
-            "memory_limit": "2g",
-            "image_tag_suffix": "",
-            "port_mapping": {"8080": "8080"},
-            "environment": {"ENV": "production", "LOG_LEVEL": "warn"},
-        },
-    }
-
-    if environment not in env_configs:
+    if environment not in _ENV_CONFIGS:
         environment = "dev"
 
-    env_config = env_configs[environment]
+    env_config = _ENV_CONFIGS[environment]
 
     deployment = base_config.get("deployment", {})
     deployment.update(
@@ -532,11 +599,8 @@ def generate_deployment_config_for_environment(
             "container_name": f"{container_name}-{environment}",
             "cpu_limit": env_config["cpu_limit"],
             "memory_limit": env_config["memory_limit"],
-            "port_mapping": env_config["port_mapping"],
-            "environment": {
-                **deployment.get("environment", {}),
-                **env_config["environment"],
-            },
+            "port_mapping": dict(env_config["port_mapping"]),
+            "environment": deployment.get("environment", {}) | env_config["environment"],
             "restart_policy": deployment.get("restart_policy", "unless-stopped"),
             "health_check_endpoint": deployment.get("health_check_endpoint", "/health"),
             "health_check_timeout": deployment.get("health_check_timeout", 30),
@@ -13,46 +13,59 @@ Example: python3 prepare_container_for_promotion.py influxdb ollama minikube
 import sys
 import os
 from pathlib import Path
-import json
+from datetime import datetime
+import hashlib
+import logging
+import threading
+import traceback
 import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Add parent directory to path to import dockerpilot
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
+
+# Add parent directories to path to import dockerpilot and the shared utils
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.json_io import dumps as _dumps, loads as _loads
+from utils.naming import safe_name as _safe_name
 
 from dockerpilot.pilot import DockerPilotEnhanced
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import docker
 
+_index_lock = threading.Lock()
+
 def extract_container_config(container):
     """Extract full configuration from running container"""
     attrs = container.attrs
+    config = attrs.get('Config') or {}
+    host_config = attrs.get('HostConfig') or {}
     
     # Extract image tag
-    image_tag = attrs.get('Config', {}).get('Image', '')
+    image_tag = config.get('Image', '')
     if not image_tag:
         image_tag = container.image.tags[0] if container.image.tags else container.image.id
     
     # Extract port mappings
     port_mapping = {}
-    if 'NetworkSettings' in attrs:
-        ports = attrs['NetworkSettings'].get('Ports', {})
-        for container_port, host_bindings in ports.items():
-            if host_bindings:
-                # Format: "3000/tcp" -> "3000"
-                port_num = container_port.split('/')[0]
-                # Get first host port
-                host_port = host_bindings[0].get('HostPort', '')
-                if host_port:
-                    port_mapping[port_num] = host_port
+    ports = (attrs.get('NetworkSettings') or {}).get('Ports') or {}
+    for container_port, host_bindings in ports.items():
+        if host_bindings:
+            # Format: "3000/tcp" -> "3000"
+            port_num = container_port.split('/')[0]
+            # Get first host port
+            host_port = host_bindings[0].get('HostPort', '')
+            if host_port:
+                port_mapping[port_num] = host_port
     
     # Extract environment variables
-    environment = {}
-    env_list = attrs.get('Config', {}).get('Env', [])
-    for env_var in env_list:
-        if '=' in env_var:
-            key, value = env_var.split('=', 1)
-            environment[key] = value
+    env_list = config.get('Env') or []
+    environment = {key: value for key, sep, value in (env_var.partition('=') for env_var in env_list) if sep}
     
     # Extract volumes
     volumes = {}
@@ -73,19 +86,17 @@ def extract_container_config(container):
             elif source:
                 # Docker volume but no name - try to extract from path or use source
                 # Extract volume name from path like: /var/lib/docker/volumes/volume_name/_data
-                if '/volumes/' in source:
-                    vol_path_parts = source.split('/volumes/')
-                    if len(vol_path_parts) > 1:
-                        vol_id = vol_path_parts[1].split('/')[0]
-                        # Use volume ID as name if no name available
-                        volumes[vol_id] = destination
+                _, sep, vol_path = source.partition('/volumes/')
+                if sep:
+                    vol_id = vol_path.partition('/')[0]
+                    # Use volume ID as name if no name available
+                    volumes[vol_id] = destination
                 else:
                     # Fallback to source path
                     volumes[source] = destination
     
     # Extract restart policy
     restart_policy = 'no'
-    host_config = attrs.get('HostConfig', {})
     restart_policy_config = host_config.get('RestartPolicy', {})
     if restart_policy_config:
         restart_policy = restart_policy_config.get('Name', 'no')
@@ -108,7 +119,7 @@ def extract_container_config(container):
             memory_limit = f"{int(memory_mb)}Mi"
     
     # Extract command
-    cmd = attrs.get('Config', {}).get('Cmd', [])
+    cmd = config.get('Cmd')
     command = ' '.join(cmd) if cmd else None
     
     return {
@@ -172,17 +183,41 @@ def create_deployment_config(container_config, env='dev'):
     
     return deployment
 
-def prepare_container_for_promotion(container_name, dry_run=False):
-    """Prepare a single container for promotion"""
+def index_deployments(deployments_dir):
+    """Map lowercased container names to (deployment directory, metadata)
+    
+    Reads each deployments/*/metadata.json once so that preparing many
+    containers does not rescan the directory for every one of them.
+    """
+    index = {}
+    for d in deployments_dir.iterdir():
+        try:
+            metadata = _loads((d / 'metadata.json').read_bytes())
+            container_name = metadata.get('container_name', '')
+            if container_name and d.name.startswith(_safe_name(container_name) + '_'):
+                index.setdefault(container_name.lower(), (d, metadata))
+        except Exception:
+            continue
+    return index
+
+def _docker_client():
+    """Create a Docker client the same way DockerPilot resolves its endpoint"""
+    # Initialize DockerPilot without banner and with minimal logging
+    logging.getLogger('DockerPilot').setLevel(logging.WARNING)
+    
+    return DockerPilotEnhanced().client
+
+def prepare_container_for_promotion(container_name, dry_run=False, client=None, deployment_index=None):
+    """Prepare a single container for promotion
+    
+    Pass a shared ``client`` and ``deployment_index`` (see index_deployments)
+    when preparing several containers; otherwise both are built for this call.
+    """
     console = Console()
     
     try:
-        # Initialize DockerPilot without banner and with minimal logging
-        import logging
-        logging.getLogger('DockerPilot').setLevel(logging.WARNING)
-        
-        pilot = DockerPilotEnhanced()
-        client = pilot.client
+        if client is None:
+            client = _docker_client()
         
         # Get container
         try:
@@ -215,71 +250,52 @@ def prepare_container_for_promotion(container_name, dry_run=False):
         
         # Save to unified deployment directory structure
         # Use the same logic as backend but without importing Flask app
-        from datetime import datetime
-        import hashlib
-        import re
-        
         # Generate deployment directory
         deployments_dir = Path.home() / '.dockerpilot_extras' / 'deployments'
-        deployments_dir.mkdir(exist_ok=True, parents=True)
+        if deployment_index is None:
+            # main() creates the directory and index once for the whole run
+            deployments_dir.mkdir(exist_ok=True, parents=True)
+            deployment_index = index_deployments(deployments_dir)
         
         # Find or create deployment directory
         container_name = container_config['container_name']
-        safe_name = re.sub(r'[^a-zA-Z0-9_-]', '_', container_name.lower())
+        safe_name = _safe_name(container_name)
         
-        # Find existing deployment or create new
-        deployment_dir = None
-        for d in deployments_dir.iterdir():
-            if d.is_dir() and d.name.startswith(safe_name + '_'):
-                metadata_path = d / 'metadata.json'
-                if metadata_path.exists():
-                    try:
-                        with open(metadata_path, 'r') as f:
-                            metadata = json.load(f)
-                            if metadata.get('container_name', '').lower() == container_name.lower():
-                                deployment_dir = d
-                                break
-                    except:
-                        pass
-        
-        if not deployment_dir:
-            # Create new deployment directory
-            timestamp = datetime.now().isoformat()
-            hash_input = f"{container_name}_{container_config['image_tag']}_{timestamp}"
-            hash_value = hashlib.sha256(hash_input.encode()).hexdigest()[:12]
-            unique_id = f"{hash_value[:4]}!{hash_value[4:8]}{hash_value[8:12]}"
-            deployment_id = f"{safe_name}_{unique_id}"
-            deployment_dir = deployments_dir / deployment_id
-            deployment_dir.mkdir(exist_ok=True, parents=True)
+        # Find existing deployment or create new; the lock keeps concurrent
+        # workers from creating two directories for one container
+        with _index_lock:
+            deployment_dir, metadata = deployment_index.get(container_name.lower(), (None, None))
+            
+            if not deployment_dir:
+                # Create new deployment directory
+                timestamp = datetime.now().isoformat()
+                hash_input = f"{container_name}_{container_config['image_tag']}_{timestamp}"
+                hash_value = hashlib.blake2b(hash_input.encode(), digest_size=6).hexdigest()
+                unique_id = f"{hash_value[:4]}!{hash_value[4:8]}{hash_value[8:12]}"
+                deployment_id = f"{safe_name}_{unique_id}"
+                deployment_dir = deployments_dir / deployment_id
+                deployment_dir.mkdir(exist_ok=True)
             
-            # Create metadata
-            metadata = {
-                'container_name': container_name,
-                'image_tag': container_config['image_tag'],
-                'created_at': datetime.now().isoformat(),
-                'deployment_id': deployment_id
-            }
-            metadata_path = deployment_dir / 'metadata.json'
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+                # Create metadata
+                metadata = {
+                    'container_name': container_name,
+                    'image_tag': container_config['image_tag'],
+                    'created_at': datetime.now().isoformat(),
+                    'deployment_id': deployment_id
+                }
+                deployment_index[container_name.lower()] = (deployment_dir, metadata)
         
         # Save deployment-dev.yml
         config_path = deployment_dir / 'deployment-dev.yml'
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(deployment_config, f, default_flow_style=False, allow_unicode=True)
-        
-        # Update metadata
-        metadata_path = deployment_dir / 'metadata.json'
-        if metadata_path.exists():
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-        else:
-            metadata = {}
+        config_path.write_bytes(yaml.dump(
+            deployment_config, Dumper=SafeDumper, default_flow_style=False,
+            allow_unicode=True, encoding='utf-8'
+        ))
         
+        # Update metadata (written once, including for new deployments)
         metadata['last_updated'] = datetime.now().isoformat()
         metadata['env_dev_config'] = str(config_path)
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        (deployment_dir / 'metadata.json').write_bytes(_dumps(metadata))
         
         console.print(f"[green]✅ Configuration saved to: {config_path}[/green]")
         
@@ -287,7 +303,6 @@ def prepare_container_for_promotion(container_name, dry_run=False):
         
     except Exception as e:
         console.print(f"[red]❌ Error preparing {container_name}: {e}[/red]")
-        import traceback
         console.print(f"[red]{traceback.format_exc()}[/red]")
         return False
 
@@ -301,29 +316,48 @@ def main():
     dry_run = '--dry-run' in container_names
     if dry_run:
         container_names.remove('--dry-run')
+    # The same name twice would race on one deployment directory
+    container_names = list(dict.fromkeys(container_names))
     
     console = Console()
     console.print(f"[bold cyan]Preparing {len(container_names)} containers for promotion...[/bold cyan]")
     
     results = {'success': [], 'failed': []}
     
+    # DockerPilot must be set up on the main thread (it installs signal
+    # handlers); workers share its client, which pools HTTP connections
+    client = _docker_client()
+    if client is None:
+        console.print("[red]❌ Docker is not available[/red]")
+        return False
+    total = len(container_names)
+    
+    deployments_dir = Path.home() / '.dockerpilot_extras' / 'deployments'
+    deployments_dir.mkdir(exist_ok=True, parents=True)
+    deployment_index = index_deployments(deployments_dir)
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console
-    ) as progress:
+    ) as progress, ThreadPoolExecutor(max_workers=min(8, total) or 1) as pool:
         
+        futures = {}
         for i, container_name in enumerate(container_names, 1):
-            task = progress.add_task(f"[{i}/{len(container_names)}] {container_name}...", total=None)
-            
-            success = prepare_container_for_promotion(container_name, dry_run)
-            
-            if success:
-                progress.update(task, description=f"[{i}/{len(container_names)}] ✅ {container_name}")
-                results['success'].append(container_name)
-            else:
-                progress.update(task, description=f"[{i}/{len(container_names)}] ❌ {container_name}")
-                results['failed'].append(container_name)
+            task = progress.add_task(f"[{i}/{total}] {container_name}...", total=None)
+            future = pool.submit(
+                prepare_container_for_promotion, container_name, dry_run, client, deployment_index
+            )
+            futures[future] = (i, container_name, task)
+        
+        for future in as_completed(futures):
+            i, container_name, task = futures[future]
+            mark = '✅' if future.result() else '❌'
+            progress.update(task, description=f"[{i}/{total}] {mark} {container_name}")
+    
+    # Report in command-line order rather than completion order
+    for future, (_, container_name, _) in futures.items():
+        results['success' if future.result() else 'failed'].append(container_name)
     
     # Summary
     console.print(f"\n[bold]Preparation Summary:[/bold]")
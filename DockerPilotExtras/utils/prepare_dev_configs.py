@@ -8,21 +8,50 @@ import docker
 import yaml
 from pathlib import Path
 from datetime import datetime
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def get_container_info(client, container_name):
-    """Get detailed information about a container"""
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper
+
+# Add DockerPilotExtras to path to import the shared utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.json_io import dumps as _dumps
+
+_VARIANT_SUFFIXES = ('_blue', '_green', '_canary', '_new', '_old')
+
+
+def _base_name(container_name):
+    """Container name without the leading slash and any blue/green-style variant suffix"""
+    base_name = container_name.lstrip('/')
+    if base_name.endswith(_VARIANT_SUFFIXES):
+        # Each suffix is a single '_word', so drop everything from the last '_'
+        base_name = base_name.rpartition('_')[0]
+    return base_name
+
+
+def get_container_info(client, container_name, container=None):
+    """Get detailed information about a container
+    
+    ``container`` may be an already-inspected object (e.g. from
+    ``containers.list()``), which saves looking it up again by name.
+    """
     try:
-        container = client.containers.get(container_name)
+        if container is None:
+            container = client.containers.get(container_name)
         attrs = container.attrs
+        host_config = attrs.get('HostConfig') or {}
+        network_settings = attrs.get('NetworkSettings') or {}
         
         # Get image
         image = container.image.tags[0] if container.image.tags else container.image.id
         
         # Get ports
         port_mapping = {}
-        ports = attrs.get('NetworkSettings', {}).get('Ports', {})
+        ports = network_settings.get('Ports')
         if ports:
             for container_port, host_bindings in ports.items():
                 if host_bindings:
@@ -34,12 +63,8 @@ def get_container_info(client, container_name):
                         port_mapping[container_port_clean] = host_port
         
         # Get environment variables
-        env_vars = {}
-        env_list = attrs.get('Config', {}).get('Env', [])
-        for env in env_list:
-            if '=' in env:
-                key, value = env.split('=', 1)
-                env_vars[key] = value
+        env_list = (attrs.get('Config') or {}).get('Env') or []
+        env_vars = {key: value for key, sep, value in (env.partition('=') for env in env_list) if sep}
         
         # Get volumes
         volumes = {}
@@ -51,11 +76,11 @@ def get_container_info(client, container_name):
                 volumes[source] = destination
         
         # Get restart policy
-        restart_policy = attrs.get('HostConfig', {}).get('RestartPolicy', {}).get('Name', 'unless-stopped')
+        restart_policy = (host_config.get('RestartPolicy') or {}).get('Name', 'unless-stopped')
         
         # Get network
-        network_mode = attrs.get('HostConfig', {}).get('NetworkMode', 'bridge')
-        networks = attrs.get('NetworkSettings', {}).get('Networks', {})
+        network_mode = host_config.get('NetworkMode', 'bridge')
+        networks = network_settings.get('Networks')
         network_name = None
         if network_mode != 'bridge' and network_mode not in ['host', 'none']:
             network_name = network_mode
@@ -63,14 +88,13 @@ def get_container_info(client, container_name):
             network_name = list(networks.keys())[0]
         
         # Get resource limits
-        host_config = attrs.get('HostConfig', {})
         cpu_limit = None
         memory_limit = None
         
-        if 'NanoCpus' in host_config and host_config['NanoCpus']:
+        if host_config.get('NanoCpus'):
             cpu_limit = str(host_config['NanoCpus'] / 1000000000)  # Convert to CPUs
         
-        if 'Memory' in host_config and host_config['Memory']:
+        if host_config.get('Memory'):
             memory_mb = host_config['Memory'] / (1024 * 1024)
             if memory_mb >= 1024:
                 memory_limit = f"{memory_mb / 1024:.1f}g"
@@ -95,17 +119,12 @@ def create_deployment_config(container_name, container_info, deployments_dir):
     """Create deployment-dev.yml for a container"""
     
     # Clean container name (remove leading slash, handle blue/green variants)
-    clean_name = container_name.lstrip('/')
-    base_name = clean_name
-    for suffix in ['_blue', '_green', '_canary', '_new', '_old']:
-        if base_name.endswith(suffix):
-            base_name = base_name[:-len(suffix)]
-            break
+    base_name = _base_name(container_name)
     
     # Create deployment directory
     deployment_id = f"{base_name}_{int(datetime.now().timestamp())}"
     deployment_dir = deployments_dir / deployment_id
-    deployment_dir.mkdir(exist_ok=True, parents=True)
+    deployment_dir.mkdir(exist_ok=True)
     
     # Create metadata
     metadata = {
@@ -118,8 +137,7 @@ def create_deployment_config(container_name, container_info, deployments_dir):
     }
     
     metadata_path = deployment_dir / 'metadata.json'
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2)
+    metadata_path.write_bytes(_dumps(metadata))
     
     # Create deployment-dev.yml
     deployment_config = {
@@ -145,8 +163,10 @@ def create_deployment_config(container_name, container_info, deployments_dir):
     
     # Write config file
     config_path = deployment_dir / 'deployment-dev.yml'
-    with open(config_path, 'w', encoding='utf-8') as f:
-        yaml.dump(deployment_config, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    config_path.write_bytes(yaml.dump(
+        deployment_config, Dumper=SafeDumper, default_flow_style=False,
+        allow_unicode=True, sort_keys=False, encoding='utf-8'
+    ))
     
     return config_path
 
@@ -169,7 +189,8 @@ def main():
     print(f"📦 Preparing DEV configurations for all running containers...")
     print(f"📁 Deployments directory: {deployments_dir}\n")
     
-    # Get all running containers
+    # Get all running containers; list() inspects each one, so their attrs
+    # are complete and need no second lookup
     containers = client.containers.list(filters={'status': 'running'})
     
     if not containers:
@@ -180,27 +201,48 @@ def main():
     
     created_configs = []
     
+    def prepare(container):
+        """Inspect one container and write its config; returns (info, config_path, error)"""
+        container_info = get_container_info(client, container.name, container)
+        if not container_info:
+            return None, None, None
+        try:
+            return container_info, create_deployment_config(container.name, container_info, deployments_dir), None
+        except Exception as e:
+            return container_info, None, e
+    
+    # Variants such as app_blue/app_green share a base name and, within the
+    # same second, a deployment directory: each group goes to one worker and
+    # is written in listing order, so their files never interleave
+    groups = {}
     for container in containers:
+        groups.setdefault(_base_name(container.name), []).append(container)
+    
+    def prepare_group(group):
+        return [prepare(container) for container in group]
+    
+    # Groups are independent, so run them concurrently and report in listing order
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(8, len(groups))) as pool:
+        for group, group_results in zip(groups.values(), pool.map(prepare_group, groups.values())):
+            results.update(zip((container.id for container in group), group_results))
+    
+    for container in containers:
+        container_info, config_path, error = results[container.id]
         container_name = container.name
         print(f"Processing: {container_name}...")
         
-        # Get container info
-        container_info = get_container_info(client, container_name)
         if not container_info:
             print(f"  ⚠️  Skipped: Could not get container info")
-            continue
-        
-        # Create deployment config
-        try:
-            config_path = create_deployment_config(container_name, container_info, deployments_dir)
+        elif error:
+            print(f"  ❌ Error creating config: {error}")
+        else:
             created_configs.append({
                 'container': container_name,
                 'config': str(config_path),
                 'image': container_info['image']
             })
             print(f"  ✅ Created: {config_path}")
-        except Exception as e:
-            print(f"  ❌ Error creating config: {e}")
     
     print(f"\n{'='*60}")
     print(f"✅ Successfully created {len(created_configs)} DEV configuration(s)")
@@ -7,6 +7,7 @@ Example: python3 promote_all_containers.py dev staging
 
 import sys
 import os
+import json
 from pathlib import Path
 
 # Add parent directory to path to import dockerpilot
@@ -19,6 +20,10 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 def find_all_deployment_configs(env: str = 'dev') -> list:
     """Find all deployment configs for given environment"""
     import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
     configs = []
     deployments_dir = Path.home() / '.dockerpilot_extras' / 'deployments'
     
@@ -29,14 +34,21 @@ def find_all_deployment_configs(env: str = 'dev') -> list:
         if deployment_dir.is_dir():
             config_path = deployment_dir / f'deployment-{env}.yml'
             if config_path.exists():
-                # Try to get container name from config file
+                # metadata.json records the container name, which saves parsing the YAML
                 try:
-                    with open(config_path, 'r') as f:
-                        config = yaml.safe_load(f)
-                        container_name = config.get('deployment', {}).get('container_name', deployment_dir.name.split('_')[0])
-                except:
-                    # Fallback to directory name
-                    container_name = deployment_dir.name.split('_')[0]
+                    container_name = json.loads((deployment_dir / 'metadata.json').read_bytes()).get('container_name')
+                except (OSError, ValueError, AttributeError):
+                    container_name = None
+                
+                if not container_name:
+                    # Try to get container name from config file
+                    try:
+                        with open(config_path, 'r') as f:
+                            config = yaml.load(f, Loader=SafeLoader)
+                            container_name = config.get('deployment', {}).get('container_name', deployment_dir.name.split('_')[0])
+                    except:
+                        # Fallback to directory name
+                        container_name = deployment_dir.name.split('_')[0]
                 
                 configs.append({
                     'path': str(config_path),
@@ -534,10 +534,12 @@ class BackupRestoreMixin:
                 if container_name:
                     self._update_progress('backup', 18, '💾 Saving backup metadata...')
                 
+                # Every container.image access fetches the image from the daemon
+                container_image = container.image
                 backup_metadata = {
                     'container_name': container_name,
                     'backup_time': datetime.now().isoformat(),
-                    'container_image': container.image.tags[0] if container.image.tags else container.image.id,
+                    'container_image': container_image.tags[0] if container_image.tags else container_image.id,
                     'volumes': backed_up_volumes,
                     'total_size': sum(v.get('size', 0) for v in backed_up_volumes)
                 }
@@ -1606,9 +1608,10 @@ class BackupRestoreMixin:
             containers_backup = []
             
             for container in containers:
+                container_image = container.image
                 container_info = {
                     'name': container.name,
-                    'image': container.image.tags[0] if container.image.tags else container.image.id,
+                    'image': container_image.tags[0] if container_image.tags else container_image.id,
                     'status': container.status,
                     'ports': container.ports,
                     'environment': container.attrs.get('Config', {}).get('Env', []),
@@ -1,13 +1,118 @@
 """Container management operations."""
+import codecs
 import docker
+import json
+import sys
 import time
-from typing import List, Any, Optional
+from contextlib import closing
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Confirm
 
-from .utils import format_ports, get_container_size, calculate_uptime
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .utils import format_ports, get_container_size, calculate_uptime, parse_memory_limit, ports_from_api
+
+
+# Daemon event emitted when a container reaches each status that is waited on
+_STATUS_EVENTS = {'running': 'start', 'exited': 'die', 'paused': 'pause'}
+
+
+@lru_cache(maxsize=8)
+def _container_columns(available_width: int) -> Tuple[Tuple[str, str, int], ...]:
+    """(name, style, width) of each container table column for a terminal width."""
+    # Use proportional widths that adapt to terminal size
+    # For smaller terminals, some columns will be narrower
+    if available_width >= 140:
+        # Large terminal - full width columns
+        return (
+            ("Nr", "bold blue", 4),
+            ("ID", "cyan", 12),
+            ("Name", "green", min(25, int(available_width * 0.15))),
+            ("Status", "magenta", 10),
+            ("Image", "yellow", min(30, int(available_width * 0.20))),
+            ("Ports", "bright_blue", min(30, int(available_width * 0.20))),
+            ("Size", "white", 10),
+            ("Uptime", "bright_green", 12),
+        )
+    if available_width >= 100:
+        # Medium terminal - reduce some columns
+        return (
+            ("Nr", "bold blue", 3),
+            ("ID", "cyan", 10),
+            ("Name", "green", min(20, int(available_width * 0.18))),
+            ("Status", "magenta", 8),
+            ("Image", "yellow", min(25, int(available_width * 0.22))),
+            ("Ports", "bright_blue", min(25, int(available_width * 0.22))),
+            ("Size", "white", 8),
+            ("Uptime", "bright_green", 10),
+        )
+    # Small terminal - minimal columns, remove less critical ones
+    # Size and Uptime are left out for very small terminals to save space
+    return (
+        ("Nr", "bold blue", 3),
+        ("ID", "cyan", 8),
+        ("Name", "green", min(18, int(available_width * 0.25))),
+        ("Status", "magenta", 7),
+        ("Image", "yellow", min(20, int(available_width * 0.30))),
+        ("Ports", "bright_blue", min(20, int(available_width * 0.30))),
+    )
+
+
+@lru_cache(maxsize=32)
+def _status_markup(state: str) -> str:
+    """Colored status cell markup, built once per distinct container state."""
+    status_color = "green" if state == "running" else "red" if state == "exited" else "yellow"
+    return f"[{status_color}]{state}[/{status_color}]"
+
+
+def _volume_from_dict(key: str, value: dict) -> Optional[str]:
+    """Volume spec from {'bind': ..., 'mode': ...}; None when 'bind' is missing."""
+    if 'bind' not in value:
+        return None
+    return f"{key}:{value['bind']}:{value.get('mode', 'rw')}"
+
+
+def _volume_from_str(key: str, value: str) -> str:
+    """Volume spec for a host path or named volume mapped to a container path."""
+    return f"{key}:{value}"
+
+
+# Volume spec builders keyed by the exact type of the mapping value
+_VOLUME_FORMATTERS = {dict: _volume_from_dict, str: _volume_from_str}
+
+
+def _volume_formatter(value: Any):
+    """Spec builder for a volume mapping value; None for an unknown format."""
+    formatter = _VOLUME_FORMATTERS.get(type(value))
+    if formatter is None:
+        # Subclasses such as OrderedDict, ruamel's CommentedMap or str enums
+        for base, candidate in _VOLUME_FORMATTERS.items():
+            if isinstance(value, base):
+                return candidate
+    return formatter
+
+
+def _listed_image(container: Dict[str, Any]) -> Optional[str]:
+    """Image reference of a low-level listing entry, None when it is only an image ID.
+
+    The listing holds the reference the container was created from, so an
+    untagged one such as 'nginx' gets the implied ':latest' to read like
+    the image tags shown by inspect.
+    """
+    image = container.get('Image')
+    if not image or image.startswith('sha256:'):
+        return None
+    if '@' not in image and ':' not in image.rpartition('/')[2]:
+        image += ':latest'
+    return image
 
 
 class ContainerManager:
@@ -21,29 +126,40 @@ class ContainerManager:
         self._error_handler = error_handler
     
     def list_containers(self, show_all: bool = True, format_output: str = "table") -> List[Any]:
-        """Enhanced container listing with multiple output formats."""
+        """Enhanced container listing with multiple output formats.
+
+        JSON output returns one summary dict per container; table output
+        returns the raw GET /containers/json entries ('Id', 'Names', 'State', ...).
+        """
         with self._error_handler("list containers"):
-            containers = self.client.containers.list(all=show_all)
+            # A single GET /containers/json; the high-level containers.list()
+            # inspects every container and c.image fetches its image on top
+            containers = self.client.api.containers(all=show_all)
             
             if format_output == "json":
                 container_data = []
                 for c in containers:
-                    # Get state from container attributes
-                    state = c.attrs.get('State', {}).get('Status', c.status).lower()
+                    status = c.get('State', '')
                     container_data.append({
-                        'id': c.short_id,
-                        'name': c.name,
-                        'status': c.status,
-                        'state': state,
-                        'image': c.image.tags[0] if c.image.tags else "none",
-                        'ports': c.ports,
-                        'created': c.attrs['Created'],
+                        'id': c['Id'][:12],
+                        'name': c['Names'][0].lstrip('/'),
+                        'status': status,
+                        'state': status.lower(),
+                        'image': _listed_image(c) or "none",
+                        'ports': ports_from_api(c.get('Ports')),
+                        # RFC 3339 in UTC like inspect's Created, but the listing only has whole seconds
+                        'created': datetime.fromtimestamp(c['Created'], timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
                         'size': get_container_size(c)
                     })
                 # Don't print JSON in API context, just return data
                 # self.console.print_json(data=container_data)
                 return container_data
             
+            if not self.console.is_terminal:
+                # Redirected output: Rich would strip the table styling anyway
+                self._print_containers_plain(containers)
+                return containers
+            
             # Enhanced table view with auto-scaling to terminal width
             # Get terminal width for dynamic column sizing
             terminal_width = self.console.width if hasattr(self.console, 'width') else 120
@@ -63,53 +179,30 @@ class ContainerManager:
             # Track if Size and Uptime columns were added
             include_size_uptime = available_width >= 100
             
-            # Use proportional widths that adapt to terminal size
-            # For smaller terminals, some columns will be narrower
-            if available_width >= 140:
-                # Large terminal - full width columns
-                table.add_column("Nr", style="bold blue", width=4, overflow="fold")
-                table.add_column("ID", style="cyan", width=12, overflow="fold")
-                table.add_column("Name", style="green", width=min(25, int(available_width * 0.15)), overflow="fold")
-                table.add_column("Status", style="magenta", width=10, overflow="fold")
-                table.add_column("Image", style="yellow", width=min(30, int(available_width * 0.20)), overflow="fold")
-                table.add_column("Ports", style="bright_blue", width=min(30, int(available_width * 0.20)), overflow="fold")
-                table.add_column("Size", style="white", width=10, overflow="fold")
-                table.add_column("Uptime", style="bright_green", width=12, overflow="fold")
-            elif available_width >= 100:
-                # Medium terminal - reduce some columns
-                table.add_column("Nr", style="bold blue", width=3, overflow="fold")
-                table.add_column("ID", style="cyan", width=10, overflow="fold")
-                table.add_column("Name", style="green", width=min(20, int(available_width * 0.18)), overflow="fold")
-                table.add_column("Status", style="magenta", width=8, overflow="fold")
-                table.add_column("Image", style="yellow", width=min(25, int(available_width * 0.22)), overflow="fold")
-                table.add_column("Ports", style="bright_blue", width=min(25, int(available_width * 0.22)), overflow="fold")
-                table.add_column("Size", style="white", width=8, overflow="fold")
-                table.add_column("Uptime", style="bright_green", width=10, overflow="fold")
-            else:
-                # Small terminal - minimal columns, remove less critical ones
-                table.add_column("Nr", style="bold blue", width=3, overflow="fold")
-                table.add_column("ID", style="cyan", width=8, overflow="fold")
-                table.add_column("Name", style="green", width=min(18, int(available_width * 0.25)), overflow="fold")
-                table.add_column("Status", style="magenta", width=7, overflow="fold")
-                table.add_column("Image", style="yellow", width=min(20, int(available_width * 0.30)), overflow="fold")
-                table.add_column("Ports", style="bright_blue", width=min(20, int(available_width * 0.30)), overflow="fold")
-                # Remove Size and Uptime for very small terminals to save space
+            for name, style, width in _container_columns(available_width):
+                table.add_column(name, style=style, width=width, overflow="fold")
 
+            # Summary counts, taken while building the rows
+            running = stopped = 0
             for idx, c in enumerate(containers, start=1):
                 # Status formatting
-                status_color = "green" if c.status == "running" else "red" if c.status == "exited" else "yellow"
-                status = f"[{status_color}]{c.status}[/{status_color}]"
+                state = c.get('State', '')
+                if state == "running":
+                    running += 1
+                elif state == "exited":
+                    stopped += 1
+                status = _status_markup(state)
                 
                 # Ports formatting
-                ports = format_ports(c.ports)
+                ports = format_ports(ports_from_api(c.get('Ports')))
                 
                 # Build row data
                 row_data = [
                     str(idx),
-                    c.short_id,
-                    c.name,
+                    c['Id'][:12],
+                    c['Names'][0].lstrip('/'),
                     status,
-                    c.image.tags[0] if c.image.tags else "❌ none",
+                    _listed_image(c) or "❌ none",
                     ports
                 ]
                 
@@ -124,17 +217,45 @@ class ContainerManager:
             self.console.print(table)
             
             # Summary statistics
-            running = len([c for c in containers if c.status == "running"])
-            stopped = len([c for c in containers if c.status == "exited"])
             total = len(containers)
             
             summary = f"📊 Summary: {total} total, {running} running, {stopped} stopped"
             self.console.print(Panel(summary, style="bright_blue"))
             
+            # Container models built from a listing would lack name, ports and
+            # labels (like containers.list(sparse=True)), so return the entries
             return containers
     
-    def container_operation(self, operation: str, container_name: str, **kwargs) -> bool:
-        """Unified container operation handler with progress tracking."""
+    def _print_containers_plain(self, containers: List[Dict[str, Any]]):
+        """Write a container listing as tab-separated lines plus a summary line."""
+        lines = ["ID\tNAME\tSTATUS\tIMAGE\tPORTS"]
+        running = stopped = 0
+        for c in containers:
+            state = c.get('State', '')
+            if state == "running":
+                running += 1
+            elif state == "exited":
+                stopped += 1
+            lines.append("\t".join((
+                c['Id'][:12],
+                c['Names'][0].lstrip('/'),
+                state,
+                _listed_image(c) or "none",
+                format_ports(ports_from_api(c.get('Ports')))
+            )))
+        lines.append(f"Summary: {len(containers)} total, {running} running, {stopped} stopped")
+        
+        out = self.console.file
+        out.write("\n".join(lines) + "\n")
+        out.flush()
+    
+    def container_operation(self, operation: str, container_name: str, show_progress: Optional[bool] = None,
+                            **kwargs) -> bool:
+        """Unified container operation handler with progress tracking.
+        
+        The spinner is shown when show_progress is set or, by default, when the
+        console is a terminal; otherwise only the outcome line is printed.
+        """
         operations = {
             'start': self._start_container,
             'stop': self._stop_container,
@@ -168,26 +289,35 @@ class ContainerManager:
             "rename": "renamed",
         }
         
+        verb_ing = progress_verbs.get(operation, f"{operation.title()}ing")
+        verb_past = success_verbs.get(operation, f"{operation}ed")
+        failure = f"❌ Failed to {operation} container {container_name}"
+        
+        def run_operation():
+            try:
+                result = operations[operation](container_name, **kwargs)
+            except Exception as e:
+                self.logger.error(f"Container {operation} failed: {e}")
+                return False, failure
+            return result, f"✅ Container {container_name} {verb_past} successfully" if result else failure
+        
+        if show_progress is None:
+            show_progress = self.console.is_terminal
+        if not show_progress:
+            # No spinner (and no renderer thread) for non-interactive callers
+            result, outcome = run_operation()
+            self.console.print(outcome)
+            return result
+        
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.console
         ) as progress:
-            verb_ing = progress_verbs.get(operation, f"{operation.title()}ing")
-            verb_past = success_verbs.get(operation, f"{operation}ed")
             task = progress.add_task(f"{verb_ing} container {container_name}...", total=None)
-            
-            try:
-                result = operations[operation](container_name, **kwargs)
-                if result:
-                    progress.update(task, description=f"✅ Container {container_name} {verb_past} successfully")
-                else:
-                    progress.update(task, description=f"❌ Failed to {operation} container {container_name}")
-                return result
-            except Exception as e:
-                progress.update(task, description=f"❌ Failed to {operation} container {container_name}")
-                self.logger.error(f"Container {operation} failed: {e}")
-                return False
+            result, outcome = run_operation()
+            progress.update(task, description=outcome)
+            return result
     
     def update_restart_policy(self, container_name: str, policy: str = 'unless-stopped') -> bool:
         """Set restart policy on container."""
@@ -238,22 +368,24 @@ class ContainerManager:
                 'name': name,
                 'detach': True,
             }
+            # Settings summary, printed in one go before the container is created
+            details: List[str] = []
             
             # Add ports if provided
             if ports:
                 container_kwargs['ports'] = ports
-                self.console.print(f"[dim]  Ports: {ports}[/dim]")
+                details.append(f"  Ports: {ports}")
             
             # Add command if provided
             if command:
                 container_kwargs['command'] = command
-                self.console.print(f"[dim]  Command: {command}[/dim]")
+                details.append(f"  Command: {command}")
             
             # Add environment variables if provided
             if environment:
                 container_kwargs['environment'] = environment
                 env_count = len(environment)
-                self.console.print(f"[dim]  Environment variables: {env_count} set[/dim]")
+                details.append(f"  Environment variables: {env_count} set")
             
             # Add volumes if provided
             if volumes:
@@ -261,11 +393,11 @@ class ContainerManager:
                 normalized_volumes = self._normalize_volumes(volumes)
                 container_kwargs['volumes'] = normalized_volumes
                 vol_count = len(normalized_volumes)
-                self.console.print(f"[dim]  Volumes: {vol_count} mounted[/dim]")
+                details.append(f"  Volumes: {vol_count} mounted")
             
             # Add restart policy
             container_kwargs['restart_policy'] = {"Name": restart_policy}
-            self.console.print(f"[dim]  Restart policy: {restart_policy}[/dim]")
+            details.append(f"  Restart policy: {restart_policy}")
             
             # Add network if specified
             if network:
@@ -273,12 +405,12 @@ class ContainerManager:
                     container_kwargs['network_mode'] = 'host'
                 else:
                     container_kwargs['network'] = network
-                self.console.print(f"[dim]  Network: {network}[/dim]")
+                details.append(f"  Network: {network}")
             
             # Add privileged mode if requested
             if privileged:
                 container_kwargs['privileged'] = True
-                self.console.print(f"[dim]  Privileged mode: enabled[/dim]")
+                details.append("  Privileged mode: enabled")
             
             # Add resource limits
             resource_limits = {}
@@ -286,27 +418,23 @@ class ContainerManager:
                 try:
                     cpu_limit_nano = float(cpu_limit) * 1000000000
                     resource_limits['nano_cpus'] = int(cpu_limit_nano)
-                    self.console.print(f"[dim]  CPU limit: {cpu_limit}[/dim]")
+                    details.append(f"  CPU limit: {cpu_limit}")
                 except ValueError:
                     self.logger.warning(f"Invalid CPU limit format: {cpu_limit}")
             
             if memory_limit:
                 try:
-                    memory_str = memory_limit.lower()
-                    if memory_str.endswith('g'):
-                        memory_bytes = int(float(memory_str[:-1]) * 1024 * 1024 * 1024)
-                    elif memory_str.endswith('m'):
-                        memory_bytes = int(float(memory_str[:-1]) * 1024 * 1024)
-                    else:
-                        memory_bytes = int(memory_str)
-                    resource_limits['mem_limit'] = memory_bytes
-                    self.console.print(f"[dim]  Memory limit: {memory_limit}[/dim]")
+                    resource_limits['mem_limit'] = parse_memory_limit(memory_limit)
+                    details.append(f"  Memory limit: {memory_limit}")
                 except ValueError:
                     self.logger.warning(f"Invalid memory limit format: {memory_limit}")
             
             if resource_limits:
                 container_kwargs.update(resource_limits)
             
+            if not self.console.quiet:
+                self.console.print("\n".join(details), style="dim")
+            
             # Create and start container
             container = self.client.containers.run(**container_kwargs)
             
@@ -347,24 +475,19 @@ class ContainerManager:
             return []
         
         normalized = []
+        skipped = []
         for key, value in volumes.items():
+            formatter = _volume_formatter(value)
+            spec = formatter(key, value) if formatter else None
+            if spec is None:
+                skipped.append((key, value))
+            else:
+                normalized.append(spec)
+        
+        # Report malformed entries after the fact, off the normal path
+        for key, value in skipped:
             if isinstance(value, dict):
-                # Already in correct format with bind and mode
-                if 'bind' in value:
-                    bind_path = value['bind']
-                    mode = value.get('mode', 'rw')
-                    normalized.append(f"{key}:{bind_path}:{mode}")
-                else:
-                    self.logger.warning(f"Volume dict for '{key}' missing 'bind', skipping")
-            elif isinstance(value, str):
-                # Simple format: host_path -> container_path
-                # Check if it's a named volume (doesn't start with /)
-                if not key.startswith('/') and not key.startswith('./') and not key.startswith('../'):
-                    # Named volume
-                    normalized.append(f"{key}:{value}")
-                else:
-                    # Bind mount
-                    normalized.append(f"{key}:{value}")
+                self.logger.warning(f"Volume dict for '{key}' missing 'bind', skipping")
             else:
                 self.logger.warning(f"Unknown volume format for key '{key}': {type(value)}")
         
@@ -373,88 +496,117 @@ class ContainerManager:
     def _start_container(self, container_name: str, **kwargs) -> bool:
         """Start container with enhanced validation."""
         with self._error_handler("start container", container_name):
-            container = self.client.containers.get(container_name)
+            # Raw inspect: only the state and ID are needed, not a Container object
+            container = self.client.api.inspect_container(container_name)
             
-            if container.status == "running":
+            if container['State'].get('Running'):
                 self.console.print(f"[yellow]⚠️ Container {container_name} is already running[/yellow]")
                 return True
             
-            container.start()
-            self._wait_for_container_status(container_name, "running", timeout=30)
+            # Subscribe before starting so the start event cannot be missed
+            with closing(self._status_events(container['Id'], timeout=30)) as events:
+                self.client.api.start(container['Id'])
+                self._wait_for_container_status(container_name, "running", timeout=30, events=events)
             self.logger.info(f"Container {container_name} started successfully")
             return True
     
     def _stop_container(self, container_name: str, timeout: int = 10, **kwargs) -> bool:
         """Stop container with graceful shutdown."""
         with self._error_handler("stop container", container_name):
-            container = self.client.containers.get(container_name)
+            container = self.client.api.inspect_container(container_name)
             
-            if container.status == "exited":
+            if container['State'].get('Status') == "exited":
                 self.console.print(f"[yellow]⚠️ Container {container_name} is already stopped[/yellow]")
                 return True
             
-            container.stop(timeout=timeout)
+            self.client.api.stop(container['Id'], timeout=timeout)
             self.logger.info(f"Container {container_name} stopped successfully")
             return True
     
     def _restart_container(self, container_name: str, timeout: int = 10, **kwargs) -> bool:
         """Restart container with health check."""
         with self._error_handler("restart container", container_name):
-            container = self.client.containers.get(container_name)
-            container.restart(timeout=timeout)
-            self._wait_for_container_status(container_name, "running", timeout=30)
+            # The API takes names directly, so no inspect is needed first
+            with closing(self._status_events(container_name, timeout=30)) as events:
+                self.client.api.restart(container_name, timeout=timeout)
+                self._wait_for_container_status(container_name, "running", timeout=30, events=events)
             self.logger.info(f"Container {container_name} restarted successfully")
             return True
     
     def _remove_container(self, container_name: str, force: bool = False, **kwargs) -> bool:
         """Remove container with safety checks."""
         with self._error_handler("remove container", container_name):
-            container = self.client.containers.get(container_name)
-            
-            if container.status == "running" and not force:
-                if not Confirm.ask(f"Container {container_name} is running. Force removal?"):
+            if not force:
+                container = self.client.api.inspect_container(container_name)
+                if container['State'].get('Running') and not Confirm.ask(
+                        f"Container {container_name} is running. Force removal?"):
                     self.console.print("[yellow]❌ Removal cancelled[/yellow]")
                     return False
             
-            container.remove(force=force)
+            self.client.api.remove_container(container_name, force=force)
             self.logger.info(f"Container {container_name} removed successfully")
             return True
     
     def _pause_container(self, container_name: str, **kwargs) -> bool:
         """Pause container."""
         with self._error_handler("pause container", container_name):
-            container = self.client.containers.get(container_name)
-            container.pause()
+            self.client.api.pause(container_name)
             self.logger.info(f"Container {container_name} paused successfully")
             return True
     
     def _unpause_container(self, container_name: str, **kwargs) -> bool:
         """Unpause container."""
         with self._error_handler("unpause container", container_name):
-            container = self.client.containers.get(container_name)
-            container.unpause()
+            self.client.api.unpause(container_name)
             self.logger.info(f"Container {container_name} unpaused successfully")
             return True
     
     def _rename_container(self, container_name: str, new_name: str, **kwargs) -> bool:
         """Rename container."""
         with self._error_handler("rename container", container_name):
-            container = self.client.containers.get(container_name)
-            container.rename(new_name)
+            self.client.api.rename(container_name, new_name)
             self.logger.info(f"Container {container_name} renamed to {new_name} successfully")
             return True
     
-    def _wait_for_container_status(self, container_name: str, expected_status: str, timeout: int = 30) -> bool:
-        """Wait for container to reach expected status."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                container = self.client.containers.get(container_name)
-                if container.status == expected_status:
+    def _container_status(self, container_name: str) -> str:
+        """Current status of a container, read from a raw inspect."""
+        return self.client.api.inspect_container(container_name)['State']['Status']
+    
+    def _status_events(self, container: str, timeout: int):
+        """Open the daemon event stream of a container (name or ID), ending timeout seconds from now."""
+        # Whole seconds: the daemon does not read float timestamps as such
+        since = int(time.time())
+        return self.client.api.events(
+            since=since,
+            until=since + timeout + 1,
+            filters={'container': container, 'event': sorted(set(_STATUS_EVENTS.values()))},
+            decode=True
+        )
+    
+    def _wait_for_container_status(self, container_name: str, expected_status: str, timeout: int = 30,
+                                   events=None) -> bool:
+        """Wait for container to reach expected status.
+        
+        Blocks on the daemon event stream rather than polling. Pass events
+        opened with _status_events before the operation being waited on.
+        """
+        action = _STATUS_EVENTS.get(expected_status)
+        try:
+            if events is None:
+                if self._container_status(container_name) == expected_status:
+                    return True
+                with closing(self._status_events(container_name, timeout)) as own_events:
+                    return self._wait_for_container_status(container_name, expected_status, timeout, own_events)
+            
+            for event in events:
+                if event.get('Action', event.get('status')) == action:
                     return True
-                time.sleep(1)
-            except Exception:
-                time.sleep(1)
+            
+            # The stream ends at its deadline; the status may still have been reached
+            if self._container_status(container_name) == expected_status:
+                return True
+        except Exception as e:
+            self.logger.warning(f"Could not follow events of container {container_name}: {e}")
         
         self.logger.warning(f"Container {container_name} did not reach status {expected_status} within {timeout}s")
         return False
@@ -465,6 +617,10 @@ class ContainerManager:
         Args:
             container_names: Single container name/ID or comma-separated list of names/IDs
             tail: Number of log lines to show per container
+        
+        Raises:
+            ValueError: If no container is named and stdin is not a terminal,
+                so the selection menu could not be answered
         """
         if container_names:
             # Parse multiple container names if comma-separated
@@ -477,42 +633,60 @@ class ContainerManager:
             for container_name in names_list:
                 try:
                     container = self.client.containers.get(container_name)
-                    logs = container.logs(tail=tail).decode()
                     self.console.print(f"\n[bold cyan]{'='*60}[/bold cyan]")
                     self.console.print(f"[cyan]Container: {container_name} - Last {tail} lines[/cyan]")
                     self.console.print(f"[bold cyan]{'='*60}[/bold cyan]\n")
-                    self.console.print(logs)
+                    self._print_logs(container, tail)
                 except docker.errors.NotFound:
                     self.console.print(f"[red]Container '{container_name}' not found[/red]")
                 except Exception as e:
                     self.console.print(f"[red]Error reading logs for '{container_name}': {e}[/red]")
         else:
-            containers = self.client.containers.list(all=True)
+            if not sys.stdin.isatty():
+                raise ValueError("container_names required in non-interactive mode")
+            
+            # The menu only needs names and states, which the listing carries
+            containers = self.client.api.containers(all=True)
             if not containers:
                 self.console.print("[red]No containers found[/red]")
                 return
             
             self.console.print("\nSelect a container to view logs:")
             for i, c in enumerate(containers, start=1):
-                self.console.print(f"{i}. {c.name} ({c.status})")
+                self.console.print(f"{i}. {c['Names'][0].lstrip('/')} ({c.get('State', '')})")
             
             choice = input("Enter number: ")
             try:
                 idx = int(choice) - 1
-                container = containers[idx]
-                logs = container.logs(tail=tail).decode()
-                self.console.print(f"\n[cyan]Showing last {tail} lines of {container.name} logs:[/cyan]\n")
-                self.console.print(logs)
+                selected = containers[idx]
+                name = selected['Names'][0].lstrip('/')
+                self.console.print(f"\n[cyan]Showing last {tail} lines of {name} logs:[/cyan]\n")
+                self._print_logs(self.client.containers.prepare_model(selected), tail)
             except (ValueError, IndexError):
                 self.console.print("[red]Invalid selection[/red]")
     
+    def _print_logs(self, container, tail: int):
+        """Write container logs to the console as the daemon sends them.
+        
+        Chunks go straight to the console file, without markup parsing; the
+        incremental decoder keeps UTF-8 sequences split across chunks intact.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        out = self.console.file
+        for chunk in container.logs(tail=tail, stream=True, follow=False):
+            out.write(decoder.decode(chunk))
+        out.write(decoder.decode(b'', final=True))
+        out.flush()
+    
     def view_container_json(self, container_name: str):
         """Display container information in JSON format."""
-        import json
         try:
             container = self.client.containers.get(container_name)
             data = container.attrs
-            json_str = json.dumps(data, indent=4, ensure_ascii=False)
+            if orjson is not None:
+                json_str = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+            else:
+                json_str = json.dumps(data, indent=2, ensure_ascii=False)
             self.console.print(Panel(json_str, title=f"Container JSON: {container_name}", expand=True))
         except docker.errors.NotFound:
             self.console.print(f"[red]Container '{container_name}' not found[/red]")
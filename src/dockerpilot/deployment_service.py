@@ -17,6 +17,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from .models import DeploymentConfig
+from .utils import parse_memory_limit
 
 
 def _load_dockerfile_template_bodies() -> dict[str, str]:
@@ -1988,15 +1989,7 @@ class DeploymentServiceMixin:
         if config.memory_limit:
             # Convert memory limit (e.g., "1g" -> bytes)
             try:
-                memory_str = config.memory_limit.lower()
-                if memory_str.endswith('g'):
-                    memory_bytes = int(float(memory_str[:-1]) * 1024 * 1024 * 1024)
-                elif memory_str.endswith('m'):
-                    memory_bytes = int(float(memory_str[:-1]) * 1024 * 1024)
-                else:
-                    memory_bytes = int(memory_str)
-                
-                limits['mem_limit'] = memory_bytes
+                limits['mem_limit'] = parse_memory_limit(config.memory_limit)
             except:
                 pass
         
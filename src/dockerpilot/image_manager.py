@@ -4,7 +4,7 @@ from typing import List, Any
 from rich.table import Table
 from rich.panel import Panel
 
-from .utils import format_image_size, format_creation_date, count_containers_using_image
+from .utils import format_image_size, format_creation_date, count_containers_by_image
 
 
 class ImageManager:
@@ -109,6 +109,11 @@ class ImageManager:
                 table.add_column("Created", style="bright_blue", width=min(15, int(available_width * 0.25)), overflow="fold")
                 # Remove "Used By" for very small terminals to save space
 
+            if include_used_by:
+                # Containers per image ID from one listing, instead of walking
+                # every container again for each image; 0 for all if it fails
+                usage = count_containers_by_image(self.client)
+
             for idx, img in enumerate(images, start=1):
                 # Parse repository and tag
                 if img.tags:
@@ -139,7 +144,7 @@ class ImageManager:
                 
                 # Add "Used By" only if column exists
                 if include_used_by:
-                    used_by = count_containers_using_image(self.client, img.id)
+                    used_by = usage.get(img.id, 0)
                     row_data.append(str(used_by))
                 
                 table.add_row(*row_data)
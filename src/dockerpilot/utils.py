@@ -1,6 +1,12 @@
 """Utility functions for Docker Pilot."""
-from datetime import datetime
-from typing import Dict, Any
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+# Memory limits such as "512m", "1.5g" or "2GB": a number and an optional unit
+_MEMORY_RE = re.compile(r'^\s*([0-9]*\.?[0-9]+)\s*([kmgt]?)b?\s*$', re.IGNORECASE)
+_MEMORY_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
 
 
 def format_image_size(size_bytes: int) -> str:
@@ -16,6 +22,18 @@ def format_image_size(size_bytes: int) -> str:
     return f"{size:.1f} TB"
 
 
+def parse_memory_limit(memory_limit: str) -> int:
+    """Convert a memory limit like '1g' or '512m' to bytes.
+    
+    Raises:
+        ValueError: If the limit is not a number with an optional k/m/g/t unit
+    """
+    match = _MEMORY_RE.match(memory_limit)
+    if not match:
+        raise ValueError(f"Invalid memory limit: {memory_limit!r}")
+    return int(float(match[1]) * _MEMORY_UNITS[match[2].lower()])
+
+
 def format_creation_date(created_str: str) -> str:
     """Format creation date for display."""
     try:
@@ -56,22 +74,46 @@ def format_ports(ports: dict) -> str:
     return ", ".join(port_list) if port_list else "none"
 
 
+def ports_from_api(port_list: Optional[List[Dict[str, Any]]]) -> dict:
+    """Convert the 'Ports' list of a low-level container listing to the
+    {'80/tcp': [{'HostIp': ..., 'HostPort': ...}]} shape of Container.ports."""
+    ports: Dict[str, Any] = {}
+    for port in port_list or ():
+        key = f"{port['PrivatePort']}/{port.get('Type', 'tcp')}"
+        public_port = port.get('PublicPort')
+        if public_port is None:
+            ports.setdefault(key, None)
+        else:
+            bindings = ports.get(key) or []
+            bindings.append({'HostIp': port.get('IP', ''), 'HostPort': str(public_port)})
+            ports[key] = bindings
+    return ports
+
+
 def get_container_size(container: Any) -> str:
     """Get container size."""
     try:
-        # This is approximate - Docker doesn't provide easy size calculation
+        # Only listings requested with size=True carry the writable layer size
+        if isinstance(container, dict) and container.get('SizeRw') is not None:
+            return format_image_size(container['SizeRw'])
         return "N/A"  # Could be enhanced with df commands
     except Exception:
         return "N/A"
 
 
 def calculate_uptime(container: Any) -> str:
-    """Calculate container uptime."""
+    """Calculate container uptime from a Container or a low-level listing entry."""
     try:
-        if container.status != "running":
-            return "N/A"
+        if isinstance(container, dict):
+            if container.get('State') != "running":
+                return "N/A"
+            # Listings report Created as a Unix timestamp
+            created = datetime.fromtimestamp(container['Created'], timezone.utc)
+        else:
+            if container.status != "running":
+                return "N/A"
+            created = datetime.fromisoformat(container.attrs['Created'].replace('Z', '+00:00'))
         
-        created = datetime.fromisoformat(container.attrs['Created'].replace('Z', '+00:00'))
         uptime = datetime.now(created.tzinfo) - created
         
         days = uptime.days
@@ -88,17 +130,17 @@ def calculate_uptime(container: Any) -> str:
         return "N/A"
 
 
-def count_containers_using_image(client: Any, image_id: str) -> int:
-    """Count containers using specific image."""
+def count_containers_by_image(client: Any) -> Counter:
+    """Count containers per image ID from one container listing (empty on failure)."""
     try:
-        containers = client.containers.list(all=True)
-        count = 0
-        for container in containers:
-            if container.image.id == image_id:
-                count += 1
-        return count
+        return Counter(c['ImageID'] for c in client.api.containers(all=True))
     except Exception:
-        return 0
+        return Counter()
+
+
+def count_containers_using_image(client: Any, image_id: str) -> int:
+    """Count containers using specific image."""
+    return count_containers_by_image(client)[image_id]
 
 
 def calculate_cpu_percent(stats1: dict, stats2: dict) -> float:
@@ -1,9 +1,13 @@
 """Tests for container manager result handling."""
 
+import io
+from collections import OrderedDict
 from contextlib import contextmanager
 
+import pytest
 from rich.console import Console
 
+from dockerpilot import container_manager as container_manager_module
 from dockerpilot.container_manager import ContainerManager
 
 
@@ -18,7 +22,7 @@ class DummyLogger:
 
 
 @contextmanager
-def noop_error_handler(_operation):
+def noop_error_handler(_operation, *_args):
     """A no-op error handler context manager."""
     yield
 
@@ -49,3 +53,224 @@ def test_container_operation_rename_reports_renamed_in_success_message():
     assert result is True
     assert "Container old-name renamed successfully" in output
     assert "renameed successfully" not in output
+
+
+class FakeAPI:
+    """Low-level API stub returning a fixed container listing."""
+
+    def __init__(self, listing) -> None:
+        self.listing = listing
+        self.calls = []
+
+    def containers(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.listing
+
+
+class FakeContainers:
+    """High-level containers collection that must not be used for listing."""
+
+    def list(self, **_kwargs):
+        raise AssertionError("list_containers must not inspect containers one by one")
+
+
+class FakeClient:
+    def __init__(self, listing) -> None:
+        self.api = FakeAPI(listing)
+        self.containers = FakeContainers()
+
+
+LISTING = [
+    {
+        "Id": "0123456789abcdef0123",
+        "Names": ["/web"],
+        "Image": "nginx:latest",
+        "State": "running",
+        "Status": "Up 2 hours",
+        "Created": 1700000000,
+        "Ports": [
+            {"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+            {"PrivatePort": 443, "Type": "tcp"},
+        ],
+    },
+    {
+        "Id": "fedcba9876543210fedc",
+        "Names": ["/old"],
+        "Image": "sha256:abc",
+        "State": "exited",
+        "Status": "Exited (0) 3 days ago",
+        "Created": 1690000000,
+        "Ports": [],
+    },
+]
+
+
+def test_list_containers_json_uses_single_listing_call():
+    console = Console(record=True, force_terminal=False, width=120)
+    client = FakeClient(LISTING)
+    manager = ContainerManager(client=client, console=console, logger=DummyLogger(), error_handler=noop_error_handler)
+
+    rows = manager.list_containers(show_all=True, format_output="json")
+
+    assert client.api.calls == [{"all": True}]
+    assert rows[0]["id"] == "0123456789ab"
+    assert rows[0]["name"] == "web"
+    assert rows[0]["state"] == "running"
+    assert rows[0]["image"] == "nginx:latest"
+    assert rows[0]["ports"] == {
+        "80/tcp": [{"HostIp": "0.0.0.0", "HostPort": "8080"}],
+        "443/tcp": None,
+    }
+    assert rows[0]["created"] == "2023-11-14T22:13:20Z"
+    assert rows[1]["image"] == "none"
+
+
+def test_list_containers_table_renders_and_returns_listing_entries():
+    console = Console(record=True, force_terminal=True, width=160)
+    client = FakeClient(LISTING)
+    manager = ContainerManager(client=client, console=console, logger=DummyLogger(), error_handler=noop_error_handler)
+
+    result = manager.list_containers(show_all=True, format_output="table")
+    output = console.export_text()
+
+    assert result == LISTING
+    assert result[0]["Names"] == ["/web"]
+    assert "8080→80/tcp" in output
+    assert "2 total, 1 running, 1 stopped" in output
+
+
+def test_list_containers_table_writes_plain_rows_when_redirected():
+    buffer = io.StringIO()
+    console = Console(file=buffer, force_terminal=False)
+    client = FakeClient(LISTING)
+    manager = ContainerManager(client=client, console=console, logger=DummyLogger(), error_handler=noop_error_handler)
+
+    result = manager.list_containers(show_all=True, format_output="table")
+    lines = buffer.getvalue().splitlines()
+
+    assert result == LISTING
+    assert lines[0] == "ID\tNAME\tSTATUS\tIMAGE\tPORTS"
+    assert lines[1] == "0123456789ab\tweb\trunning\tnginx:latest\t8080→80/tcp, 443/tcp"
+    assert lines[-1] == "Summary: 2 total, 1 running, 1 stopped"
+
+
+class FakeEventStream(list):
+    """Decoded event stream stub that records being closed."""
+
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class EventClient:
+    """Low-level API stub with one container whose event stream replays the given events."""
+
+    def __init__(self, status, events) -> None:
+        self.container_id = "0123456789abcdef0123"
+        self.status = status
+        self.started = []
+        self.stream = FakeEventStream(events)
+        self.event_kwargs = None
+        self.api = self
+
+    def inspect_container(self, _name):
+        return {"Id": self.container_id, "State": {"Status": self.status, "Running": self.status == "running"}}
+
+    def start(self, container) -> None:
+        self.started.append(container)
+
+    def events(self, **kwargs):
+        self.event_kwargs = kwargs
+        return self.stream
+
+
+def test_start_container_waits_on_start_event():
+    client = EventClient("exited", [{"Action": "start"}])
+    logger = DummyLogger()
+    logger.info = logger.warning = lambda *_args: None
+    manager = ContainerManager(client=client, console=Console(), logger=logger, error_handler=noop_error_handler)
+
+    assert manager._start_container("web") is True
+    assert client.started == [client.container_id]
+    assert client.event_kwargs["filters"]["container"] == client.container_id
+    assert client.stream.closed is True
+
+
+def test_wait_for_container_status_fails_when_stream_ends_without_event():
+    client = EventClient("exited", [{"Action": "die"}])
+    warnings = []
+    logger = DummyLogger()
+    logger.warning = warnings.append
+    manager = ContainerManager(client=client, console=Console(), logger=logger, error_handler=noop_error_handler)
+
+    assert manager._wait_for_container_status("web", "running", timeout=5) is False
+    assert client.event_kwargs["until"] - client.event_kwargs["since"] == 6
+    assert any("did not reach status running" in message for message in warnings)
+
+
+def test_normalize_volumes_formats_entries_and_warns_on_malformed():
+    warnings = []
+    logger = DummyLogger()
+    logger.warning = warnings.append
+    manager = ContainerManager(client=None, console=Console(), logger=logger, error_handler=noop_error_handler)
+
+    class ContainerPath(str):
+        pass
+
+    result = manager._normalize_volumes({
+        "/srv/app": {"bind": "/app", "mode": "ro"},
+        "./data": "/data",
+        "cache": "/cache",
+        "/srv/conf": OrderedDict(bind="/conf", mode="ro"),
+        "logs": ContainerPath("/logs"),
+        "broken": {"mode": "rw"},
+        "weird": 3,
+    })
+
+    assert result == ["/srv/app:/app:ro", "./data:/data", "cache:/cache", "/srv/conf:/conf:ro", "logs:/logs"]
+    assert len(warnings) == 2
+
+
+def test_view_container_logs_requires_name_without_terminal(monkeypatch):
+    class NoTTY:
+        def isatty(self):
+            return False
+
+    monkeypatch.setattr("sys.stdin", NoTTY())
+    manager = ContainerManager(client=None, console=Console(), logger=DummyLogger(), error_handler=noop_error_handler)
+
+    with pytest.raises(ValueError, match="non-interactive"):
+        manager.view_container_logs(None)
+
+
+def test_container_operation_shows_spinner_only_when_requested(monkeypatch):
+    console = Console(record=True, force_terminal=False, width=120)
+    manager = ContainerManager(client=None, console=console, logger=DummyLogger(), error_handler=noop_error_handler)
+    manager._pause_container = lambda *_args, **_kwargs: True
+    created = []
+
+    real_progress = container_manager_module.Progress
+    monkeypatch.setattr(container_manager_module, "Progress", lambda *a, **k: created.append(1) or real_progress(*a, **k))
+
+    assert manager.container_operation("pause", "web") is True
+    assert created == []
+    assert "Container web paused successfully" in console.export_text()
+
+    assert manager.container_operation("pause", "web", show_progress=True) is True
+    assert created == [1]
+
+
+@pytest.mark.parametrize(
+    ("image", "expected"),
+    [
+        ("nginx", "nginx:latest"),
+        ("nginx:1.25", "nginx:1.25"),
+        ("localhost:5000/app", "localhost:5000/app:latest"),
+        ("nginx@sha256:abc", "nginx@sha256:abc"),
+        ("sha256:abc", None),
+        (None, None),
+    ],
+)
+def test_listed_image_reads_like_an_image_tag(image, expected):
+    assert container_manager_module._listed_image({"Image": image}) == expected
@@ -68,6 +68,68 @@ def test_gitlab_pipeline_single_deploy_mode_has_single_deploy_job():
     assert any("--type blue-green" in line for line in parsed["deploy"]["script"])
 
 
+def test_gitlab_pipeline_cache_tracks_argument_values():
+    module = _load_pipeline_generator_module()
+    generator = module.PipelineGenerator
+    env_vars = {"ENV": "staging"}
+    kwargs = dict(
+        project_name="demo",
+        docker_image="myrepo/myapp:latest",
+        dockerfile="./Dockerfile",
+        runner_tags=["docker"],
+        stages=["build", "deploy"],
+        env_vars=env_vars,
+    )
+
+    first = generator.generate_gitlab_pipeline(**kwargs)
+    assert generator.generate_gitlab_pipeline(**kwargs) is first
+
+    env_vars["ENV"] = "production"
+    changed = yaml.safe_load(generator.generate_gitlab_pipeline(**kwargs))
+
+    assert changed["build"]["variables"] == {"ENV": "production"}
+
+
+def test_gitlab_pipeline_distinguishes_no_runner_tags_from_empty():
+    module = _load_pipeline_generator_module()
+    generator = module.PipelineGenerator
+    kwargs = dict(
+        project_name="demo",
+        docker_image="myrepo/myapp:latest",
+        dockerfile="./Dockerfile",
+        stages=["build", "deploy"],
+        env_vars={},
+    )
+
+    untagged = yaml.safe_load(generator.generate_gitlab_pipeline(runner_tags=None, **kwargs))
+    empty = yaml.safe_load(generator.generate_gitlab_pipeline(runner_tags=[], **kwargs))
+
+    assert untagged["build"]["tags"] is None
+    assert empty["build"]["tags"] == []
+
+
+def test_gitlab_pipeline_renders_values_the_cache_cannot_key():
+    module = _load_pipeline_generator_module()
+    generator = module.PipelineGenerator
+    kwargs = dict(
+        project_name="demo",
+        docker_image="myrepo/myapp:latest",
+        dockerfile="./Dockerfile",
+        runner_tags=["docker"],
+        stages=["build"],
+    )
+
+    unhashable = yaml.safe_load(generator.generate_gitlab_pipeline(
+        env_vars={"A": [1, 2]}, registry_url={"x": 1}, **kwargs
+    ))
+    as_int = yaml.safe_load(generator.generate_gitlab_pipeline(env_vars={"A": 1}, **kwargs))
+    as_bool = yaml.safe_load(generator.generate_gitlab_pipeline(env_vars={"A": True}, **kwargs))
+
+    assert unhashable["build"]["variables"] == {"A": [1, 2]}
+    assert as_int["build"]["variables"] == {"A": 1}
+    assert as_bool["build"]["variables"] == {"A": True}
+
+
 def test_jenkins_pipeline_includes_scan_and_smoke_steps():
     module = _load_pipeline_generator_module()
 
@@ -90,3 +152,11 @@ def test_jenkins_pipeline_includes_scan_and_smoke_steps():
     assert "trivy:latest image --severity CRITICAL --exit-code 0" in content
     assert "stage('Smoke test')" in content
     assert "pytest -q" in content
+
+
+def test_parse_env_vars_splits_on_first_equals_and_trims():
+    module = _load_pipeline_generator_module()
+
+    parsed = module.parse_env_vars("\n  A = 1 \nnot-a-pair\n\nURL=postgres://u:p@h/db?x=1\r\nA=2\n")
+
+    assert parsed == {"A": "2", "URL": "postgres://u:p@h/db?x=1"}
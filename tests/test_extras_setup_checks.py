@@ -17,7 +17,7 @@ def _load_check_web_setup_module():
 @dataclass
 class _RunResult:
     returncode: int
-    stdout: str = ""
+    stdout: bytes = b""
 
 
 def test_check_node_success(monkeypatch):
@@ -25,9 +25,9 @@ def test_check_node_success(monkeypatch):
 
     def fake_run(command, **_kwargs):
         if command[0] == "node":
-            return _RunResult(returncode=0, stdout="v20.11.0\n")
+            return _RunResult(returncode=0, stdout=b"v20.11.0\n")
         if command[0] == "npm":
-            return _RunResult(returncode=0, stdout="10.9.0\n")
+            return _RunResult(returncode=0, stdout=b"10.9.0\n")
         raise AssertionError(f"Unexpected command: {command}")
 
     monkeypatch.setattr(module.subprocess, "run", fake_run)
@@ -57,9 +57,35 @@ def test_check_dockerpilot_timeout(monkeypatch):
     assert module.check_dockerpilot() is False
 
 
+def test_probe_versions_runs_each_command_once(monkeypatch):
+    module = _load_check_web_setup_module()
+    calls = []
+
+    def fake_run(command, **_kwargs):
+        calls.append(command[0])
+        if command[0] == "docker":
+            return _RunResult(returncode=1)
+        return _RunResult(returncode=0, stdout=f"{command[0]} 1.0\n".encode())
+
+    monkeypatch.setattr(module.subprocess, "run", fake_run)
+
+    versions = module.probe_versions()
+
+    assert versions == {
+        "node": "node 1.0",
+        "npm": "npm 1.0",
+        "docker": None,
+        "dockerpilot": "dockerpilot 1.0",
+    }
+    assert module.check_node() is True
+    assert module.check_docker() is False
+    assert sorted(calls) == ["docker", "dockerpilot", "node", "npm"]
+
+
 def test_main_returns_zero_when_required_checks_pass_and_optional_warns(monkeypatch):
     module = _load_check_web_setup_module()
 
+    monkeypatch.setattr(module, "probe_versions", lambda: {})
     monkeypatch.setattr(module, "check_python_version", lambda: True)
     monkeypatch.setattr(module, "check_python_dependencies", lambda: True)
     monkeypatch.setattr(module, "check_node", lambda: True)
@@ -73,6 +99,7 @@ def test_main_returns_zero_when_required_checks_pass_and_optional_warns(monkeypa
 def test_main_returns_nonzero_when_required_check_fails(monkeypatch):
     module = _load_check_web_setup_module()
 
+    monkeypatch.setattr(module, "probe_versions", lambda: {})
     monkeypatch.setattr(module, "check_python_version", lambda: True)
     monkeypatch.setattr(module, "check_python_dependencies", lambda: True)
     monkeypatch.setattr(module, "check_node", lambda: True)
@@ -81,3 +108,18 @@ def test_main_returns_nonzero_when_required_check_fails(monkeypatch):
     monkeypatch.setattr(module, "check_dockerpilot", lambda: True)
 
     assert module.main() == 1
+
+
+def test_check_python_dependencies_reports_missing_without_importing(monkeypatch):
+    module = _load_check_web_setup_module()
+    looked_up = []
+
+    def fake_find_spec(name):
+        looked_up.append(name)
+        return None if name == "flask_restful" else object()
+
+    monkeypatch.delenv("DP_STORAGE_BACKEND", raising=False)
+    monkeypatch.setattr(module.importlib.util, "find_spec", fake_find_spec)
+
+    assert module.check_python_dependencies() is False
+    assert looked_up == ["flask", "flask_cors", "flask_restful", "yaml"]
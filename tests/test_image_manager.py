@@ -0,0 +1,65 @@
+"""Tests for image manager listing."""
+
+from contextlib import contextmanager
+
+from rich.console import Console
+
+from dockerpilot.image_manager import ImageManager
+
+
+@contextmanager
+def noop_error_handler(_operation, *_args):
+    """A no-op error handler context manager."""
+    yield
+
+
+class FakeImage:
+    def __init__(self, image_id, tags) -> None:
+        self.id = image_id
+        self.tags = tags
+        self.attrs = {"Size": 1024, "Created": None}
+
+
+class FakeClient:
+    """Client stub with a fixed image list and container listing."""
+
+    def __init__(self, images, container_listing) -> None:
+        self.image_list = images
+        self.container_listing = container_listing
+        self.listing_calls = 0
+        self.images = self
+        self.api = self
+
+    def list(self, **_kwargs):
+        return self.image_list
+
+    def containers(self, **_kwargs):
+        self.listing_calls += 1
+        return self.container_listing
+
+
+def test_list_images_counts_users_from_one_container_listing():
+    images = [FakeImage("sha256:" + "a" * 64, ["nginx:latest"]), FakeImage("sha256:" + "b" * 64, ["redis:7"])]
+    listing = [{"ImageID": images[0].id}, {"ImageID": images[0].id}]
+    client = FakeClient(images, listing)
+    console = Console(record=True, force_terminal=False, width=160)
+    manager = ImageManager(client=client, console=console, logger=None, error_handler=noop_error_handler)
+
+    manager.list_images(format_output="table")
+    rows = [line for line in console.export_text().splitlines() if "nginx" in line or "redis" in line]
+
+    assert client.listing_calls == 1
+    assert rows[0].rstrip(" │").endswith("2")
+    assert rows[1].rstrip(" │").endswith("0")
+
+
+def test_list_images_shows_zero_users_when_container_listing_fails():
+    images = [FakeImage("sha256:" + "a" * 64, ["nginx:latest"])]
+    client = FakeClient(images, None)
+    console = Console(record=True, force_terminal=False, width=160)
+    manager = ImageManager(client=client, console=console, logger=None, error_handler=noop_error_handler)
+
+    manager.list_images(format_output="table")
+    rows = [line for line in console.export_text().splitlines() if "nginx" in line]
+
+    assert rows[0].rstrip(" │").endswith("0")
@@ -0,0 +1,47 @@
+"""Tests for shared utility helpers."""
+
+import pytest
+
+from dockerpilot.utils import count_containers_using_image, parse_memory_limit
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1g", 1024 ** 3),
+        ("512M", 512 * 1024 ** 2),
+        ("1.5gb", int(1.5 * 1024 ** 3)),
+        ("64k", 64 * 1024),
+        ("1048576", 1048576),
+    ],
+)
+def test_parse_memory_limit(value, expected):
+    assert parse_memory_limit(value) == expected
+
+
+def test_parse_memory_limit_rejects_unknown_units():
+    with pytest.raises(ValueError):
+        parse_memory_limit("2x")
+
+
+class FakeAPI:
+    def __init__(self, listing=None, error=None) -> None:
+        self.api = self
+        self.listing = listing
+        self.error = error
+
+    def containers(self, **_kwargs):
+        if self.error:
+            raise self.error
+        return self.listing
+
+
+def test_count_containers_using_image_counts_from_listing():
+    client = FakeAPI(listing=[{"ImageID": "sha256:a"}, {"ImageID": "sha256:a"}, {"ImageID": "sha256:b"}])
+
+    assert count_containers_using_image(client, "sha256:a") == 2
+    assert count_containers_using_image(client, "sha256:c") == 0
+
+
+def test_count_containers_using_image_is_zero_when_listing_fails():
+    assert count_containers_using_image(FakeAPI(error=RuntimeError("daemon gone")), "sha256:a") == 0
@@ -5,21 +5,31 @@ Captures network packets and displays them in real-time via Flask-SocketIO web i
 """
 
 import argparse
+import gzip
 import logging
+import mmap
 import os
+import select
+import socket
+import struct
 import sys
 import subprocess
 import threading
 import time
-from collections import deque
-from datetime import datetime
 from typing import Optional, Dict, Any
 
-from scapy.all import sniff, IP, TCP, UDP, ICMP, ARP, Ether
-from flask import Flask, render_template_string
-from flask_socketio import SocketIO
+from scapy.all import conf, sniff, IP, TCP, UDP, ICMP, ARP, Ether
+from scapy.interfaces import network_name
+from scapy.packet import NoPayload
+from flask import Flask, Response, request
+from flask_socketio import SocketIO, join_room
 import json
 
+try:
+    import msgpack
+except ImportError:  # optional; fall back to JSON packets
+    msgpack = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +37,183 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Captured packets are sent to clients in batches at this interval (seconds)
+EMIT_INTERVAL = 0.1
+# Slots in the ring between the capture thread and the emitter (power of two)
+EMIT_RING_SIZE = 4096
+# Packets beyond this emit backlog are dropped (and counted) instead of queued
+EMIT_HIGH_WATER = 3072
+# How often the dropped-packet count is sent to clients (seconds)
+DROP_REPORT_INTERVAL = 1.0
+# Socket.IO room every dashboard client joins; packet traffic is sent to it
+DASHBOARD_ROOM = 'dashboard'
+# Longest a capture loop blocks before checking for a stop request (seconds)
+STOP_POLL_INTERVAL = 0.25
+# How long stop_sniffing waits for the capture and emit threads (seconds)
+STOP_TIMEOUT = 2.0
+
+# Last whole second formatted by _packet_time and its "HH:MM:SS" text
+_last_sec = [0, '']
+# ".mmm" suffix for every millisecond, indexed instead of formatted per packet
+_MILLIS = [f".{ms:03d}" for ms in range(1000)]
+
+
+def _packet_time() -> str:
+    """Current local time as HH:MM:SS.mmm, formatting the seconds part once per second"""
+    now = time.time()
+    sec = int(now)
+    if sec != _last_sec[0]:
+        _last_sec[1] = time.strftime('%H:%M:%S', time.localtime(sec))
+        _last_sec[0] = sec
+    return _last_sec[1] + _MILLIS[int((now - sec) * 1000)]
+
+
+# AF_PACKET constants from <linux/if_packet.h> / <linux/if_ether.h>
+SOL_PACKET = 263
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+ETH_P_ALL = 0x0003
+SO_ATTACH_FILTER = 26
+
+# TPACKET_V3 receive ring: the kernel hands a block over when it is full or
+# after RING_BLOCK_TIMEOUT_MS, so quiet links still show packets promptly
+RING_BLOCK_SIZE = 1 << 18
+RING_BLOCK_COUNT = 16
+RING_FRAME_SIZE = 2048
+RING_BLOCK_TIMEOUT_MS = 50
+RING_POLL_TIMEOUT_MS = 100
+
+_TPACKET_REQ3 = struct.Struct('7I')
+_U32 = struct.Struct('I')
+# tpacket_hdr_v1 from block_status on: block_status, num_pkts, offset_to_first_pkt
+_BLOCK_HDR = struct.Struct('3I')
+_BLOCK_STATUS_OFFSET = 8
+# tpacket3_hdr: tp_next_offset, tp_sec, tp_nsec, tp_snaplen, tp_len, tp_status, tp_mac
+_PACKET_HDR = struct.Struct('6IH')
+_ETHERTYPE = struct.Struct('!H')
+_IPV4_HDR = struct.Struct('!BBHHHBBH4s4s')
+# Option-less IPv4 header plus the first four transport bytes (the ports)
+_IPV4_L4 = struct.Struct('!BBHHHBBH4s4sHH')
+_PORTS = struct.Struct('!HH')
+# IPv4-over-Ethernet ARP: sender and target protocol addresses
+_ARP_ADDRS = struct.Struct('!14x4s6x4s')
+
+
+def _attach_filter(sock: socket.socket, program, drain: bool = False):
+    """Attach a BPF program (a sock_fprog) to a packet socket
+    
+    With drain, frames queued before the filter took effect are discarded so
+    an already-bound socket only yields filtered traffic. Draining stops after
+    one receive buffer's worth of data, so a busy link that matches the
+    filter cannot keep it going.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, program)
+    if drain:
+        budget = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        sock.setblocking(False)
+        try:
+            while budget > 0:
+                budget -= max(len(sock.recv(65535)), 1)
+        except BlockingIOError:
+            pass
+        finally:
+            sock.setblocking(True)
+
+
+# Comma-separated names of the SYN/ACK/FIN/PSH bits, indexed by the TCP flags byte
+_TCP_FLAG_NAMES = [
+    ', '.join(name for bit, name in ((0x02, 'SYN'), (0x10, 'ACK'), (0x01, 'FIN'), (0x08, 'PSH'))
+              if flags & bit)
+    for flags in range(256)
+]
+
+
+def _format_tcp_details(ttl: int, sport: int, dport: int, flags: int) -> str:
+    """Details text for a TCP packet, built as a single string"""
+    flag_names = _TCP_FLAG_NAMES[flags & 0xFF]
+    if flag_names:
+        return f"TTL: {ttl} | Ports: {sport} → {dport} | Flags: {flag_names}"
+    return f"TTL: {ttl} | Ports: {sport} → {dport}"
+
+
+def _decode_frame(buf, start: int, length: int) -> Optional[Dict[str, Any]]:
+    """Build packet_info from the Ethernet frame at buf[start:start + length]
+    
+    Headers are unpacked in place, so a frame in the capture ring is read
+    without being copied out. Mirrors what packet_callback reports for scapy
+    packets; returns None for frames that are neither IPv4 nor ARP.
+    """
+    end = start + length
+    if length < 14:
+        return None
+    ethertype, = _ETHERTYPE.unpack_from(buf, start + 12)
+    offset = start + 14
+    if ethertype == 0x8100 and length >= 18:  # 802.1Q VLAN tag
+        ethertype, = _ETHERTYPE.unpack_from(buf, start + 16)
+        offset = start + 18
+    
+    if ethertype == 0x0800:
+        if end < offset + _IPV4_HDR.size:
+            return None
+        if buf[offset] == 0x45 and end >= offset + _IPV4_L4.size:
+            # No IP options: header and ports come out of a single unpack
+            _, _, _, _, frag, ttl, proto, _, src, dst, sport, dport = _IPV4_L4.unpack_from(buf, offset)
+            l4 = offset + 20
+        else:
+            ver_ihl, _, _, _, frag, ttl, proto, _, src, dst = _IPV4_HDR.unpack_from(buf, offset)
+            l4 = offset + (ver_ihl & 0x0F) * 4
+            sport = dport = None
+        src = socket.inet_ntoa(src)
+        dst = socket.inet_ntoa(dst)
+        protocol = 'Other'
+        details = f"TTL: {ttl}"
+        # Only the first fragment carries the transport header
+        if not frag & 0x1FFF:
+            if proto == 6 and end >= l4 + 14:
+                protocol = 'TCP'
+                if sport is None:
+                    sport, dport = _PORTS.unpack_from(buf, l4)
+                details = _format_tcp_details(ttl, sport, dport, buf[l4 + 13])
+            elif proto == 17 and end >= l4 + 4:
+                protocol = 'UDP'
+                if sport is None:
+                    sport, dport = _PORTS.unpack_from(buf, l4)
+                details = f"TTL: {ttl} | Ports: {sport} → {dport}"
+            elif proto == 1 and end > l4:
+                protocol = 'ICMP'
+                details = f"TTL: {ttl} | Type: {buf[l4]}"
+    elif ethertype == 0x0806:
+        if end < offset + _ARP_ADDRS.size:
+            return None
+        src, dst = _ARP_ADDRS.unpack_from(buf, offset)
+        src = socket.inet_ntoa(src)
+        dst = socket.inet_ntoa(dst)
+        protocol = 'ARP'
+        details = "No additional details"
+    else:
+        return None
+    
+    return {
+        'src': src,
+        'dst': dst,
+        'protocol': protocol,
+        'size': length,
+        'details': details,
+        'time': _packet_time()
+    }
+
+
+# Socket.IO packets are MessagePack-encoded when msgpack is installed; the page
+# loads the matching client build (socket.io.msgpack bundles the msgpack parser)
+SOCKETIO_SERIALIZER = 'msgpack' if msgpack else 'default'
+SOCKETIO_CLIENT = (
+    "https://cdn.socket.io/4.5.4/socket.io.msgpack.min.js" if msgpack
+    else "https://cdn.socket.io/4.5.4/socket.io.min.js"
+)
+
 # Default HTML template
 DEFAULT_TEMPLATE = """
 <!DOCTYPE html>
@@ -35,7 +222,7 @@ DEFAULT_TEMPLATE = """
     <title>Network Packet Sniffer</title>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <script src="https://cdn.socket.io/4.5.4/socket.io.min.js"></script>
+    <script src="{{ socketio_client }}"></script>
     <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
         body {
@@ -118,13 +305,12 @@ DEFAULT_TEMPLATE = """
             border-left: 4px solid #667eea;
             background: #f8f9fa;
             border-radius: 4px;
-            transition: all 0.2s;
+            transition: background-color 0.15s;
             font-family: 'Courier New', monospace;
             font-size: 13px;
         }
         .packet-item:hover {
             background: #e9ecef;
-            transform: translateX(5px);
         }
         .packet-header {
             display: flex;
@@ -220,6 +406,10 @@ DEFAULT_TEMPLATE = """
                 <div class="stat-value" id="otherPackets">0</div>
                 <div class="stat-label">Other</div>
             </div>
+            <div class="stat-item">
+                <div class="stat-value" id="droppedPackets">0</div>
+                <div class="stat-label">Dropped</div>
+            </div>
         </div>
         <div class="error-message" id="errorMessage"></div>
         <div class="sudo-prompt" id="sudoPrompt">
@@ -250,15 +440,30 @@ DEFAULT_TEMPLATE = """
         let packetCount = 0;
         let stats = { tcp: 0, udp: 0, icmp: 0, other: 0 };
         let isSniffing = false;
+        // Packets received since the last animation frame, oldest first
+        let pending = [];
+        let flushScheduled = false;
+        // History is replayed on every connect; only the first one is applied,
+        // after a reconnect the list already shows those packets
+        let historyApplied = false;
 
         socket.on('connect', () => {
             console.log('Connected to server');
         });
 
-        socket.on('packet', (data) => {
+        socket.on('packet_batch', (batch) => {
             if (!isSniffing) return;
-            addPacket(data);
-            updateStats(data.protocol);
+            queuePackets(batch);
+        });
+
+        socket.on('packet_history', (history) => {
+            if (historyApplied) return;
+            historyApplied = true;
+            queuePackets(history);
+        });
+
+        socket.on('capture_stats', (data) => {
+            document.getElementById('droppedPackets').textContent = data.dropped;
         });
 
         socket.on('status', (data) => {
@@ -309,9 +514,45 @@ DEFAULT_TEMPLATE = """
             }
         });
 
-        function addPacket(data) {
-            packetCount++;
+        function queuePackets(packets) {
+            for (const data of packets) {
+                pending.push(data);
+            }
+            if (!flushScheduled) {
+                flushScheduled = true;
+                requestAnimationFrame(flushPackets);
+            }
+        }
+
+        // Insert everything queued since the last frame in one DOM update
+        function flushPackets() {
+            flushScheduled = false;
+            const batch = pending;
+            pending = [];
+            
             const list = document.getElementById('packetList');
+            const frag = document.createDocumentFragment();
+            // Newest on top; packets that would be trimmed right away are never built
+            const oldest = Math.max(0, batch.length - 1000);
+            for (let i = batch.length - 1; i >= oldest; i--) {
+                frag.appendChild(buildPacketItem(batch[i]));
+            }
+            list.insertBefore(frag, list.firstChild);
+            
+            // Keep only last 1000 packets
+            while (list.children.length > 1000) {
+                list.removeChild(list.lastChild);
+            }
+            
+            for (const data of batch) {
+                countProtocol(data.protocol);
+            }
+            packetCount += batch.length;
+            document.getElementById('totalPackets').textContent = packetCount;
+            updateStats();
+        }
+
+        function buildPacketItem(data) {
             const item = document.createElement('div');
             item.className = 'packet-item';
             
@@ -323,23 +564,18 @@ DEFAULT_TEMPLATE = """
                 </div>
                 <div>Size: ${data.size} bytes | ${data.details}</div>
             `;
-            
-            list.insertBefore(item, list.firstChild);
-            
-            // Keep only last 1000 packets
-            while (list.children.length > 1000) {
-                list.removeChild(list.lastChild);
-            }
-            
-            document.getElementById('totalPackets').textContent = packetCount;
+            return item;
         }
 
-        function updateStats(protocol) {
+        function countProtocol(protocol) {
             if (stats.hasOwnProperty(protocol.toLowerCase())) {
                 stats[protocol.toLowerCase()]++;
             } else {
                 stats.other++;
             }
+        }
+
+        function updateStats() {
             document.getElementById('tcpPackets').textContent = stats.tcp;
             document.getElementById('udpPackets').textContent = stats.udp;
             document.getElementById('icmpPackets').textContent = stats.icmp;
@@ -356,6 +592,7 @@ DEFAULT_TEMPLATE = """
 
         function clearPackets() {
             document.getElementById('packetList').innerHTML = '';
+            pending = [];
             packetCount = 0;
             stats = { tcp: 0, udp: 0, icmp: 0, other: 0 };
             document.getElementById('totalPackets').textContent = '0';
@@ -367,18 +604,8 @@ DEFAULT_TEMPLATE = """
 
         function applyFilter() {
             const filter = document.getElementById('filterInput').value;
-            if (isSniffing) {
-                // If sniffing, stop first, then restart with new filter
-                socket.emit('stop_sniffing');
-                setTimeout(() => {
-                    socket.emit('set_filter', { filter: filter });
-                    setTimeout(() => {
-                        socket.emit('start_sniffing');
-                    }, 500);
-                }, 500);
-            } else {
-                socket.emit('set_filter', { filter: filter });
-            }
+            // The server restarts a running capture with the new filter
+            socket.emit('set_filter', { filter: filter });
         }
 
         function submitSudoPassword() {
@@ -413,197 +640,344 @@ DEFAULT_TEMPLATE = """
 """
 
 
+def _ring_range(ring: list, start: int, stop: int) -> list:
+    """Items at absolute positions [start, stop) of a power-of-two sized ring"""
+    size = len(ring)
+    first = start & (size - 1)
+    last = first + (stop - start)
+    if last <= size:
+        return ring[first:last]
+    return ring[first:] + ring[:last - size]
+
+
+# Interpreters to try setcap on when the running one cannot take capabilities
+ALTERNATIVE_PYTHON_PATHS = (
+    '/usr/bin/python3',
+    '/usr/local/bin/python3',
+    '/bin/python3',
+)
+
+# Run as `sh -c SETCAP_SCRIPT sh <path>...`: grants capture capabilities to the
+# first path that accepts them and prints that path. It always exits 0, so a
+# non-zero status means sudo itself failed
+SETCAP_SCRIPT = (
+    'for p; do '
+    'setcap cap_net_raw,cap_net_admin=eip "$p" && { echo "$p"; exit 0; }; '
+    'done; exit 0'
+)
+
+# Protocol reported for a packet: the first of these layers it contains
+_PROTOCOLS = ((TCP, 'TCP'), (UDP, 'UDP'), (ICMP, 'ICMP'), (ARP, 'ARP'))
+
+
+def _tcp_details(ip_layer, tcp) -> str:
+    return _format_tcp_details(ip_layer.ttl, tcp.sport, tcp.dport, int(tcp.flags))
+
+
+def _udp_details(ip_layer, udp) -> str:
+    return f"TTL: {ip_layer.ttl} | Ports: {udp.sport} → {udp.dport}"
+
+
+def _icmp_details(ip_layer, icmp) -> str:
+    return f"TTL: {ip_layer.ttl} | Type: {icmp.type}"
+
+
+# Per-protocol details for IP packets: (layer to format, formatter)
+_DETAIL_FORMATTERS = {
+    'TCP': (TCP, _tcp_details),
+    'UDP': (UDP, _udp_details),
+    'ICMP': (ICMP, _icmp_details),
+}
+
+
 class PacketSniffer:
     """Network packet sniffer with filtering and statistics"""
     
-    def __init__(self, interface: Optional[str] = None, filter_str: Optional[str] = None):
+    def __init__(self, interface: Optional[str] = None, filter_str: Optional[str] = None,
+                 use_af_packet: bool = False):
         self.interface = interface
         self.filter_str = filter_str
+        self.use_af_packet = use_af_packet
+        # Compiled BPF programs keyed by (interface, filter), see _compiled_filter
+        self._bpf_cache: Dict[tuple, Any] = {}
         self.sniffing = False
         self.sniff_thread: Optional[threading.Thread] = None
+        self._flush_thread = None
+        # Stop signal of the current capture run; replaced on every start
+        self._stop_evt = threading.Event()
+        # scapy listen socket of the running capture; closed to stop it
+        self._sock = None
         self.packet_count = 0
         self.stats = {'TCP': 0, 'UDP': 0, 'ICMP': 0, 'ARP': 0, 'Other': 0}
-        self.packet_buffer = deque(maxlen=1000)  # Buffer last 1000 packets
+        # Ring of the most recent packets, replayed to newly connected clients
+        self.ring_size = 1024
+        self.ring_mask = self.ring_size - 1
+        self.ring: list = [None] * self.ring_size
+        self.ring_head = 0
         self.sudo_password: Optional[str] = None
         self.has_capabilities = False
+        # Packets waiting for the next batched emit (see _flush_loop). The
+        # capture thread only advances write_idx and the emitter only
+        # read_idx, so the hot path takes no lock.
+        self.emit_ring: list = [None] * EMIT_RING_SIZE
+        self.emit_mask = EMIT_RING_SIZE - 1
+        self.write_idx = 0
+        self.read_idx = 0
+        # Packets not sent to clients because the emitter fell behind
+        self.dropped = 0
+        self.high_water = EMIT_HIGH_WATER
         
-    def get_protocol(self, packet) -> str:
-        """Extract protocol name from packet"""
-        if TCP in packet:
-            return 'TCP'
-        elif UDP in packet:
-            return 'UDP'
-        elif ICMP in packet:
-            return 'ICMP'
-        elif ARP in packet:
-            return 'ARP'
-        else:
-            return 'Other'
+    def classify(self, packet) -> Dict[type, Any]:
+        """Map each layer class in packet to its first layer, in a single walk"""
+        layers = {}
+        layer = packet
+        while not isinstance(layer, NoPayload):
+            layers.setdefault(layer.__class__, layer)
+            layer = layer.payload
+        return layers
     
-    def get_packet_details(self, packet) -> str:
-        """Extract detailed information from packet"""
-        details = []
-        
-        if IP in packet:
-            ip_layer = packet[IP]
-            details.append(f"TTL: {ip_layer.ttl}")
-            
-            if TCP in packet:
-                tcp = packet[TCP]
-                details.append(f"Ports: {tcp.sport} → {tcp.dport}")
-                if tcp.flags:
-                    flags = []
-                    if tcp.flags & 0x02: flags.append('SYN')
-                    if tcp.flags & 0x10: flags.append('ACK')
-                    if tcp.flags & 0x01: flags.append('FIN')
-                    if tcp.flags & 0x08: flags.append('PSH')
-                    if flags:
-                        details.append(f"Flags: {', '.join(flags)}")
-            elif UDP in packet:
-                udp = packet[UDP]
-                details.append(f"Ports: {udp.sport} → {udp.dport}")
-            elif ICMP in packet:
-                icmp = packet[ICMP]
-                details.append(f"Type: {icmp.type}")
+    def get_protocol(self, layers: Dict[type, Any]) -> str:
+        """Extract protocol name from classified packet layers"""
+        for layer_class, name in _PROTOCOLS:
+            if layer_class in layers:
+                return name
+        return 'Other'
+    
+    def get_packet_details(self, layers: Dict[type, Any], protocol: Optional[str] = None) -> str:
+        """Extract detailed information from classified packet layers"""
+        ip_layer = layers.get(IP)
+        if ip_layer is None:
+            return "No additional details"
         
-        return " | ".join(details) if details else "No additional details"
+        formatter = _DETAIL_FORMATTERS.get(protocol or self.get_protocol(layers))
+        if formatter is None:
+            return f"TTL: {ip_layer.ttl}"
+        layer_class, format_details = formatter
+        return format_details(ip_layer, layers[layer_class])
     
     def packet_callback(self, packet, socketio: SocketIO):
         """Callback function for each captured packet"""
-        if not self.sniffing:
-            return
-            
         try:
-            if IP in packet or ARP in packet:
-                ip_layer = packet[IP] if IP in packet else None
-                arp_layer = packet[ARP] if ARP in packet else None
-                
-                if ip_layer:
-                    src = ip_layer.src
-                    dst = ip_layer.dst
-                elif arp_layer:
-                    src = arp_layer.psrc
-                    dst = arp_layer.pdst
-                else:
+            layers = self.classify(packet)
+            # Compare with None: a layer's truth value is len(), which
+            # serializes the packet
+            ip_layer = layers.get(IP)
+            if ip_layer is not None:
+                src, dst = ip_layer.src, ip_layer.dst
+            else:
+                arp_layer = layers.get(ARP)
+                if arp_layer is None:
                     return
-                
-                protocol = self.get_protocol(packet)
-                size = len(packet)
-                details = self.get_packet_details(packet)
-                timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-                
-                packet_info = {
-                    'src': src,
-                    'dst': dst,
-                    'protocol': protocol,
-                    'size': size,
-                    'details': details,
-                    'time': timestamp
-                }
-                
-                # Update statistics
-                if protocol in self.stats:
-                    self.stats[protocol] += 1
-                else:
-                    self.stats['Other'] += 1
-                
-                self.packet_count += 1
-                self.packet_buffer.append(packet_info)
-                
-                # Emit to clients
-                socketio.emit('packet', packet_info)
-                
-                # Log every 100 packets
-                if self.packet_count % 100 == 0:
-                    logger.info(f"Captured {self.packet_count} packets")
+                src, dst = arp_layer.psrc, arp_layer.pdst
+            
+            protocol = self.get_protocol(layers)
+            # len(packet) rebuilds the packet; captured packets keep their raw bytes
+            original = getattr(packet, 'original', None)
+            size = len(original) if original else (packet.wirelen or len(packet))
+            details = self.get_packet_details(layers, protocol)
+            timestamp = _packet_time()
+            
+            self.record_packet({
+                'src': src,
+                'dst': dst,
+                'protocol': protocol,
+                'size': size,
+                'details': details,
+                'time': timestamp
+            })
                     
         except Exception as e:
             logger.error(f"Error processing packet: {e}")
     
+    def record_packet(self, packet_info: Dict[str, Any]):
+        """Count a decoded packet and queue it for clients"""
+        protocol = packet_info['protocol']
+        
+        # Update statistics
+        if protocol in self.stats:
+            self.stats[protocol] += 1
+        else:
+            self.stats['Other'] += 1
+        
+        self.packet_count += 1
+        self.ring[self.ring_head & self.ring_mask] = packet_info
+        self.ring_head += 1
+        
+        # Queue for the next batched emit to clients, unless the emitter is
+        # too far behind; capture must never wait on it
+        if self.write_idx - self.read_idx > self.high_water:
+            self.dropped += 1
+        else:
+            self.emit_ring[self.write_idx & self.emit_mask] = packet_info
+            self.write_idx += 1
+        
+        # Log every 100 packets
+        if self.packet_count % 100 == 0:
+            logger.info(f"Captured {self.packet_count} packets")
+    
+    def _compiled_filter(self):
+        """sock_fprog for the current filter on the capture interface
+        
+        Compiling goes through libpcap/tcpdump, so each (interface, filter)
+        pair is compiled once and reused across restarts and filter changes.
+        """
+        from scapy.arch.common import compile_filter
+        from scapy.libs.structures import sock_fprog
+        
+        iface = network_name(self.interface or conf.iface)
+        key = (iface, self.filter_str)
+        cached = self._bpf_cache.get(key)
+        if cached is None:
+            # SO_ATTACH_FILTER takes a sock_fprog (unsigned short length), not
+            # libpcap's bpf_program (int length); the program is kept alongside
+            # because the sock_fprog only points at its instructions
+            program = compile_filter(self.filter_str, iface)
+            cached = self._bpf_cache[key] = (sock_fprog(program.bf_len, program.bf_insns), program)
+        return cached[0]
+    
+    def _open_af_packet(self):
+        """Open an AF_PACKET socket with a memory-mapped TPACKET_V3 receive ring"""
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        try:
+            sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            sock.setsockopt(SOL_PACKET, PACKET_RX_RING, _TPACKET_REQ3.pack(
+                RING_BLOCK_SIZE,
+                RING_BLOCK_COUNT,
+                RING_FRAME_SIZE,
+                RING_BLOCK_SIZE * RING_BLOCK_COUNT // RING_FRAME_SIZE,
+                RING_BLOCK_TIMEOUT_MS,
+                0,  # tp_sizeof_priv
+                0,  # tp_feature_req_word
+            ))
+            if self.filter_str:
+                _attach_filter(sock, self._compiled_filter())
+            sock.bind((network_name(self.interface or conf.iface), ETH_P_ALL))
+            ring = mmap.mmap(sock.fileno(), RING_BLOCK_SIZE * RING_BLOCK_COUNT)
+        except Exception:
+            sock.close()
+            raise
+        return sock, ring
+    
+    def _af_packet_loop(self, stop_evt: threading.Event):
+        """Capture from the TPACKET_V3 ring, decoding frames with _decode_frame"""
+        sock, ring = self._open_af_packet()
+        poller = select.poll()
+        poller.register(sock, select.POLLIN | select.POLLERR)
+        block = 0
+        try:
+            while not stop_evt.is_set():
+                base = block * RING_BLOCK_SIZE
+                status, num_pkts, offset = _BLOCK_HDR.unpack_from(ring, base + _BLOCK_STATUS_OFFSET)
+                if not status & TP_STATUS_USER:
+                    poller.poll(RING_POLL_TIMEOUT_MS)
+                    continue
+                
+                for _ in range(num_pkts):
+                    next_offset, _, _, snaplen, _, _, mac = _PACKET_HDR.unpack_from(ring, base + offset)
+                    try:
+                        packet_info = _decode_frame(ring, base + offset + mac, snaplen)
+                        if packet_info:
+                            self.record_packet(packet_info)
+                    except Exception as e:
+                        logger.error(f"Error processing packet: {e}")
+                    offset += next_offset
+                
+                # Hand the block back to the kernel
+                _U32.pack_into(ring, base + _BLOCK_STATUS_OFFSET, TP_STATUS_KERNEL)
+                block = (block + 1) % RING_BLOCK_COUNT
+        finally:
+            ring.close()
+            sock.close()
+    
+    def _flush_loop(self, socketio: SocketIO, stop_evt: threading.Event):
+        """Send queued packets to clients as one 'packet_batch' event per interval
+        
+        Also reports the dropped-packet count as 'capture_stats' when it changes,
+        at most once per DROP_REPORT_INTERVAL. Returns once stop_evt is set and
+        the ring is drained, so a restarted capture never has two emitters.
+        """
+        reported_dropped = None
+        next_report = 0.0
+        while True:
+            socketio.sleep(EMIT_INTERVAL)
+            end = self.write_idx
+            batch = _ring_range(self.emit_ring, self.read_idx, end)
+            self.read_idx = end
+            
+            now = time.monotonic()
+            if now >= next_report and self.dropped != reported_dropped:
+                reported_dropped = self.dropped
+                next_report = now + DROP_REPORT_INTERVAL
+                socketio.emit('capture_stats', {'dropped': reported_dropped}, to=DASHBOARD_ROOM)
+            
+            if batch:
+                socketio.emit('packet_batch', batch, to=DASHBOARD_ROOM)
+            elif stop_evt.is_set():
+                return
+    
     def set_sudo_password(self, password: str) -> bool:
         """Set sudo password and try to elevate privileges"""
         self.sudo_password = password
         
-        # First, verify the password is correct by trying a simple sudo command
+        # Resolve symlinks to get the real Python executable, then common
+        # system interpreters as fallbacks
+        real_python_path = os.path.realpath(sys.executable)
+        candidates = [real_python_path]
+        for alt_path in ALTERNATIVE_PYTHON_PATHS:
+            if os.path.exists(alt_path):
+                real_alt_path = os.path.realpath(alt_path)
+                if real_alt_path not in candidates:
+                    candidates.append(real_alt_path)
+        
+        logger.info(f"Attempting to set capabilities on: {real_python_path}")
+        
         try:
-            verify_result = subprocess.run(
-                ['sudo', '-S', '-v'],
+            # A single sudo call checks the password and tries setcap on each
+            # candidate in turn, printing the first path that worked
+            result = subprocess.run(
+                ['sudo', '-S', '-p', '', 'sh', '-c', SETCAP_SCRIPT, 'sh', *candidates],
                 input=password.encode(),
                 capture_output=True,
-                timeout=5
+                timeout=10
             )
+            error = result.stderr.decode() if result.stderr else ""
             
-            if verify_result.returncode != 0:
-                error = verify_result.stderr.decode() if verify_result.stderr else "Unknown error"
+            if result.returncode != 0:
                 if "Sorry, try again" in error or "incorrect password" in error.lower():
                     logger.warning("Invalid sudo password")
                     self.sudo_password = None
                     return False
+                logger.warning(f"sudo failed: {error or 'Unknown error'}")
             
-            # Password is valid, now try to set capabilities
-            # Resolve symlinks to get the real Python executable
-            python_path = sys.executable
-            real_python_path = os.path.realpath(python_path)
-            
-            logger.info(f"Attempting to set capabilities on: {real_python_path}")
-            
-            # Try setting capabilities on the real path
-            result = subprocess.run(
-                ['sudo', '-S', 'setcap', 'cap_net_raw,cap_net_admin=eip', real_python_path],
-                input=password.encode(),
-                capture_output=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                logger.info("Successfully set capabilities on Python interpreter")
+            capable_path = result.stdout.decode().strip() if result.returncode == 0 else ""
+            if capable_path:
+                if capable_path == real_python_path:
+                    logger.info("Successfully set capabilities on Python interpreter")
+                else:
+                    logger.info(f"Successfully set capabilities on alternative Python: {capable_path}")
+                    logger.warning("Note: You may need to use the Python at this path for capabilities to work")
                 self.has_capabilities = True
                 # Clear password from memory after use
                 self.sudo_password = None
                 return True
-            else:
-                error = result.stderr.decode() if result.stderr else "Unknown error"
+            
+            if result.returncode == 0 and error:
                 logger.warning(f"Failed to set capabilities: {error}")
-                
-                # Try alternative: set capabilities on common Python paths
-                alternative_paths = [
-                    '/usr/bin/python3',
-                    '/usr/local/bin/python3',
-                    '/bin/python3',
-                ]
-                
-                for alt_path in alternative_paths:
-                    if os.path.exists(alt_path) and alt_path != real_python_path:
-                        real_alt_path = os.path.realpath(alt_path)
-                        if real_alt_path != real_python_path:
-                            logger.info(f"Trying alternative path: {real_alt_path}")
-                            alt_result = subprocess.run(
-                                ['sudo', '-S', 'setcap', 'cap_net_raw,cap_net_admin=eip', real_alt_path],
-                                input=password.encode(),
-                                capture_output=True,
-                                timeout=5
-                            )
-                            if alt_result.returncode == 0:
-                                logger.info(f"Successfully set capabilities on alternative Python: {real_alt_path}")
-                                logger.warning("Note: You may need to use the Python at this path for capabilities to work")
-                                self.has_capabilities = True
-                                self.sudo_password = None
-                                return True
-                
-                # If all attempts failed, password is valid but setcap doesn't work
-                # This might be due to filesystem restrictions or Python being in a location
-                # where capabilities can't be set (like NFS, or Python being a script wrapper)
-                logger.warning("Could not set capabilities on any Python executable")
-                logger.info("This might be due to:")
-                logger.info("  - Python being a script wrapper (not a binary)")
-                logger.info("  - Filesystem not supporting capabilities")
-                logger.info("  - Python being on a network filesystem")
-                logger.info("Please run the script with: sudo python3 tools/searcher/searcher.py")
-                
-                # Clear password since we can't use it effectively
-                self.sudo_password = None
-                self.has_capabilities = False
-                return True  # Password was valid, but we can't use it
+            
+            # If all attempts failed, password is valid but setcap doesn't work
+            # This might be due to filesystem restrictions or Python being in a location
+            # where capabilities can't be set (like NFS, or Python being a script wrapper)
+            logger.warning("Could not set capabilities on any Python executable")
+            logger.info("This might be due to:")
+            logger.info("  - Python being a script wrapper (not a binary)")
+            logger.info("  - Filesystem not supporting capabilities")
+            logger.info("  - Python being on a network filesystem")
+            logger.info("Please run the script with: sudo python3 tools/searcher/searcher.py")
+            
+            # Clear password since we can't use it effectively
+            self.sudo_password = None
+            self.has_capabilities = False
+            return True  # Password was valid, but we can't use it
                 
         except subprocess.TimeoutExpired:
             logger.error("Timeout while verifying sudo password")
@@ -618,9 +992,11 @@ class PacketSniffer:
         """Start packet sniffing in a separate thread"""
         if self.sniffing:
             logger.warning("Sniffing already in progress, stopping first...")
-            self.stop_sniffing(socketio)
-            time.sleep(0.5)  # Give it time to stop
+        # Also waits out a capture thread that ended on its own but whose
+        # emitter is still draining
+        self.stop_sniffing(socketio)
         
+        stop_evt = self._stop_evt = threading.Event()
         self.sniffing = True
         
         def sniff_loop():
@@ -641,13 +1017,34 @@ class PacketSniffer:
                     self.sudo_password = None
                     return
                 
-                sniff(
-                    prn=lambda pkt: self.packet_callback(pkt, socketio),
-                    store=0,
-                    iface=self.interface,
-                    filter=self.filter_str,
-                    stop_filter=lambda x: not self.sniffing
-                )
+                if self.use_af_packet:
+                    self._af_packet_loop(stop_evt)
+                    return
+                
+                # Open the capture socket here so stop_sniffing can close it;
+                # that ends sniff() without a per-packet stop_filter check,
+                # and the bounded timeout covers a quiet link
+                iface = self.interface or conf.iface
+                if self.filter_str and hasattr(socket, 'AF_PACKET'):
+                    # Attach the cached program instead of letting scapy
+                    # compile the filter again on every start
+                    self._sock = conf.L2listen(iface=iface)
+                    _attach_filter(self._sock.ins, self._compiled_filter(), drain=True)
+                else:
+                    self._sock = conf.L2listen(iface=iface, filter=self.filter_str)
+                sock = self._sock
+                try:
+                    while not stop_evt.is_set():
+                        sniff(
+                            opened_socket=sock,
+                            prn=lambda pkt: self.packet_callback(pkt, socketio),
+                            store=0,
+                            timeout=STOP_POLL_INTERVAL
+                        )
+                except (OSError, ValueError):
+                    # Raised once the socket is closed under the capture loop
+                    if not stop_evt.is_set():
+                        raise
             except PermissionError as e:
                 error_msg = "Operation not permitted. Root privileges required."
                 logger.error(error_msg)
@@ -667,20 +1064,33 @@ class PacketSniffer:
                 logger.error(f"Error in sniffing thread: {e}")
                 self.sniffing = False
                 socketio.emit('status', {'status': 'error', 'message': str(e)})
+            finally:
+                # Lets the emitter drain and exit however the capture ended
+                stop_evt.set()
         
         self.sniff_thread = threading.Thread(target=sniff_loop, daemon=True)
         self.sniff_thread.start()
+        self._flush_thread = socketio.start_background_task(self._flush_loop, socketio, stop_evt)
         socketio.emit('status', {'status': 'started'})
         logger.info("Sniffing started")
     
     def stop_sniffing(self, socketio: SocketIO):
-        """Stop packet sniffing"""
-        if not self.sniffing:
-            return
-        
+        """Stop packet sniffing and wait for the capture and emit threads"""
+        was_sniffing = self.sniffing
         self.sniffing = False
-        socketio.emit('status', {'status': 'stopped'})
-        logger.info("Sniffing stopped")
+        self._stop_evt.set()
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+        
+        current = threading.current_thread()
+        for thread in (self.sniff_thread, self._flush_thread):
+            if thread is not None and thread is not current:
+                thread.join(timeout=STOP_TIMEOUT)
+        
+        if was_sniffing:
+            socketio.emit('status', {'status': 'stopped'})
+            logger.info("Sniffing stopped")
     
     def set_filter(self, filter_str: Optional[str]):
         """Update packet filter"""
@@ -688,8 +1098,21 @@ class PacketSniffer:
         self.filter_str = filter_str if filter_str and filter_str.strip() else None
         logger.info(f"Filter updated: {old_filter} -> {self.filter_str}")
         
-        # If sniffing is active, we need to restart with new filter
-        # This will be handled by the client-side code
+        # Compile now so the restart that applies it does not wait on libpcap
+        if self.filter_str and hasattr(socket, 'AF_PACKET'):
+            try:
+                self._compiled_filter()
+            except Exception as e:
+                # Reported again, with the full error, when capture starts
+                logger.debug(f"Could not precompile filter: {e}")
+        
+        # A running capture is restarted with the new filter by handle_set_filter
+    
+    def get_recent(self, n: Optional[int] = None) -> list:
+        """Return up to n of the most recent packets, oldest first"""
+        head = self.ring_head
+        count = min(n if n is not None else self.ring_size, head, self.ring_size)
+        return _ring_range(self.ring, head - count, head)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics"""
@@ -703,27 +1126,47 @@ class PacketSniffer:
 sniffer: Optional[PacketSniffer] = None
 
 app = Flask(__name__)
+# Threading mode: capture runs in OS threads blocked in recv/poll, which
+# eventlet/gevent would have to monkey-patch. Emits already happen off the
+# capture thread (see PacketSniffer._flush_loop), and with simple-websocket
+# installed clients get a real WebSocket rather than long-polling.
 socketio = SocketIO(
     app,
     cors_allowed_origins="*",
     async_mode="threading",
+    serializer=SOCKETIO_SERIALIZER,
     logger=False,
     engineio_logger=False
 )
 
 
+# The page has no per-request content, so render (and gzip) it once
+_INDEX_BODY = app.jinja_env.from_string(DEFAULT_TEMPLATE).render(
+    socketio_client=SOCKETIO_CLIENT
+).encode('utf-8')
+_INDEX_GZIP = gzip.compress(_INDEX_BODY)
+
+
 @app.route('/')
 def index():
     """Serve the main page"""
-    return render_template_string(DEFAULT_TEMPLATE)
+    if 'gzip' in request.accept_encodings:
+        return Response(_INDEX_GZIP, mimetype='text/html',
+                        headers={'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'})
+    return Response(_INDEX_BODY, mimetype='text/html', headers={'Vary': 'Accept-Encoding'})
 
 
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
     logger.info('Client connected')
+    join_room(DASHBOARD_ROOM)
     if sniffer and sniffer.sniffing:
         socketio.emit('status', {'status': 'started'})
+    if sniffer:
+        recent = sniffer.get_recent()
+        if recent:
+            socketio.emit('packet_history', recent, to=request.sid)
 
 
 @socketio.on('disconnect')
@@ -756,7 +1199,11 @@ def handle_set_filter(data):
     """Handle filter update request"""
     if sniffer:
         filter_str = data.get('filter')
+        # Restart here rather than letting the client sequence stop/set/start
+        restart = sniffer.sniffing
         sniffer.set_filter(filter_str if filter_str else None)
+        if restart:
+            sniffer.start_sniffing(socketio)
 
 
 @socketio.on('sudo_password')
@@ -863,6 +1310,12 @@ Note: This script requires root privileges for packet capture.
         help='Port to bind the web server to (default: 6008)'
     )
     
+    parser.add_argument(
+        '--af-packet',
+        action='store_true',
+        help='Capture through a memory-mapped AF_PACKET ring instead of scapy (Linux only)'
+    )
+    
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -871,6 +1324,9 @@ Note: This script requires root privileges for packet capture.
     
     args = parser.parse_args()
     
+    if args.af_packet and not hasattr(socket, 'AF_PACKET'):
+        parser.error('--af-packet is only available on Linux')
+    
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
@@ -878,7 +1334,8 @@ Note: This script requires root privileges for packet capture.
     has_permissions = check_permissions()
     
     # Initialize sniffer
-    sniffer = PacketSniffer(interface=args.interface, filter_str=args.filter)
+    sniffer = PacketSniffer(interface=args.interface, filter_str=args.filter,
+                            use_af_packet=args.af_packet)
     
     logger.info(f"Starting web server on {args.host}:{args.port}")
     logger.info(f"Interface: {args.interface or 'all'}")